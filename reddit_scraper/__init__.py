@@ -1,7 +1,7 @@
 __version__ = "0.1.0"
 __author__ = "Reddit Scraper Team"
 
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, PostRow
 from .json_scraper import JSONScraper
 from .requests_scraper import RequestsScraper
 from .proxy_manager import ProxyManager
@@ -10,5 +10,5 @@ from .config import get_config_manager, ConfigManager
 from .validation import ValidationError
 
 
-__all__ = ["BaseScraper", "JSONScraper", "RequestsScraper", "ProxyManager", 
+__all__ = ["BaseScraper", "PostRow", "JSONScraper", "RequestsScraper", "ProxyManager", 
            "CaptchaSolverManager", "ConfigManager", "get_config_manager", "ValidationError"]
\ No newline at end of file
@@ -0,0 +1,63 @@
+import asyncio
+import gc
+import sys
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, Optional, Union
+
+try:
+    import orjson
+    
+    json_loads = orjson.loads
+    JSONDecodeError = orjson.JSONDecodeError
+    
+    def json_dumps(obj: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2 if indent else orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(obj, default=default, option=option)
+except ImportError:
+    import json
+    
+    JSONDecodeError = json.JSONDecodeError
+    
+    def json_loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+    
+    def json_dumps(obj: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        return json.dumps(obj, indent=2 if indent else None, default=default, ensure_ascii=False).encode('utf-8')
+
+try:
+    import uvloop
+
+    new_event_loop = uvloop.new_event_loop
+except ImportError:
+    uvloop = None
+    new_event_loop = asyncio.new_event_loop
+
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def write_json_stream(records: Iterable[Dict[str, Any]], f: BinaryIO, lines: bool = False,
+                      default: Optional[Callable[[Any], Any]] = None) -> int:
+    count = 0
+    if lines:
+        for count, record in enumerate(records, 1):
+            f.write(json_dumps(record, default=default))
+            f.write(b'\n')
+        return count
+    
+    f.write(b'[')
+    for count, record in enumerate(records, 1):
+        f.write(b',\n  ' if count > 1 else b'\n  ')
+        f.write(json_dumps(record, default=default))
+    f.write(b'\n]' if count else b']')
+    return count
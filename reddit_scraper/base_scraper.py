@@ -1,81 +1,117 @@
+import sys
 import time
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
-from abc import ABC, abstractmethod
+import operator
+from collections import namedtuple
+from typing import Dict, Iterator, List, Optional, Any, Protocol
 
 logger = logging.getLogger(__name__)
 
+_POST_FIELDS = (
+    'id', 'title', 'author', 'selftext', 'score', 'upvote_ratio', 'num_comments',
+    'created_utc', 'subreddit', 'permalink', 'url', 'link_flair_text',
+)
+_POST_FLAGS = ('edited', 'over_18', 'is_self')
 
-class BaseScraper(ABC):
+_POST_ROW_FIELDS = _POST_FIELDS + _POST_FLAGS + ('domain',)
+
+PostRow = namedtuple('PostRow', _POST_ROW_FIELDS, defaults=(None,) * len(_POST_ROW_FIELDS))
+
+_kind_and_data = operator.itemgetter('kind', 'data')
+
+
+class RequestMaker(Protocol):
+    
+    def _make_request(self, url: str, params: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+        ...
+
+
+class BaseScraper:
+    
+    _POST_FIELDS = _POST_FIELDS
+    _POST_FLAGS = _POST_FLAGS
+    _POST_INTERNED = ('subreddit', 'author', 'link_flair_text')
+    _COMMENT_FIELDS = ('id', 'author', 'body', 'score', 'created_utc', 'parent_id')
     
     def __init__(self, delay: float = 1.0):
         self.delay = delay
     
     def _clean_post_data(self, raw_post: Dict[str, Any]) -> Dict[str, Any]:
 
-        essential_fields = {
-            'id': raw_post.get('id'),
-            'title': raw_post.get('title'),
-            'author': raw_post.get('author'),
-            'selftext': raw_post.get('selftext'),
-            'score': raw_post.get('score'),
-            'upvote_ratio': raw_post.get('upvote_ratio'),
-            'num_comments': raw_post.get('num_comments'),
-            'created_utc': raw_post.get('created_utc'),
-            'subreddit': raw_post.get('subreddit'),
-            'permalink': raw_post.get('permalink'),
-            'url': raw_post.get('url'),
-            'link_flair_text': raw_post.get('link_flair_text'),
-        }
+        get = raw_post.get
+        cleaned = {key: value for key in self._POST_FIELDS if (value := get(key)) is not None}
         
-        if raw_post.get('edited'):
-            essential_fields['edited'] = raw_post.get('edited')
+        for key in self._POST_INTERNED:
+            value = cleaned.get(key)
+            if type(value) is str:
+                cleaned[key] = sys.intern(value)
         
-        if raw_post.get('over_18'):
-            essential_fields['over_18'] = raw_post.get('over_18')
-            
-        if raw_post.get('is_self'):
-            essential_fields['is_self'] = raw_post.get('is_self')
-            
-        if not raw_post.get('is_self') and raw_post.get('domain'):
-            essential_fields['domain'] = raw_post.get('domain')
+        for key in self._POST_FLAGS:
+            value = get(key)
+            if value:
+                cleaned[key] = value
+        
+        if not cleaned.get('is_self'):
+            domain = get('domain')
+            if domain:
+                cleaned['domain'] = sys.intern(domain) if type(domain) is str else domain
         
-        return {k: v for k, v in essential_fields.items() if v is not None}
+        return cleaned
+    
+    def _clean_listing(self, children: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+
+        clean = self._clean_post_data
+        return (clean(data) for kind, data in map(_kind_and_data, children) if kind == 't3')
+    
+    def _raw_listing(self, children: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+
+        return (data for kind, data in map(_kind_and_data, children) if kind == 't3')
+    
+    def _clean_post_row(self, raw_post: Dict[str, Any]) -> PostRow:
+
+        return PostRow(**self._clean_post_data(raw_post))
     
     def _clean_comment_data(self, raw_comment: Dict[str, Any]) -> Dict[str, Any]:
 
-        essential_fields = {
-            'id': raw_comment.get('id'),
-            'author': raw_comment.get('author'),
-            'body': raw_comment.get('body'),
-            'score': raw_comment.get('score'),
-            'created_utc': raw_comment.get('created_utc'),
-            'parent_id': raw_comment.get('parent_id'),
-        }
+        get = raw_comment.get
+        cleaned = {key: value for key in self._COMMENT_FIELDS if (value := get(key)) is not None}
         
-        if 'replies' in raw_comment and raw_comment['replies']:
-            essential_fields['replies'] = raw_comment.get('replies', [])
+        replies = get('replies')
+        if replies:
+            cleaned['replies'] = replies
         
-        return {k: v for k, v in essential_fields.items() if v is not None}
+        return cleaned
     
     def _extract_comments(self, comments_children: List[Dict]) -> List[Dict[str, Any]]:
 
-        comments = []
+        comments: List[Dict[str, Any]] = []
+        stack = [(comments, comments_children)]
+        push = stack.append
+        pop = stack.pop
+        clean = self._clean_comment_data
         
-        for child in comments_children:
-            if child['kind'] == 't1':
+        while stack:
+            target, children = pop()
+            append = target.append
+            
+            for child in children:
+                if child['kind'] != 't1':
+                    continue
+                
                 comment_data = child['data']
-                comment = self._clean_comment_data(comment_data)
+                comment = clean(comment_data)
+                append(comment)
                 
-                if 'replies' in comment_data and comment_data['replies']:
-                    if isinstance(comment_data['replies'], dict):
-                        reply_children = comment_data['replies']['data']['children']
-                        comment['replies'] = self._extract_comments(reply_children)
-                    else:
-                        comment['replies'] = []
+                replies = comment_data.get('replies')
+                if not replies:
+                    continue
                 
-                comments.append(comment)
+                comment['replies'] = nested = []
+                if isinstance(replies, dict):
+                    reply_children = replies['data']['children']
+                    if reply_children:
+                        push((nested, reply_children))
                 
         return comments
     
@@ -86,8 +122,3 @@ class BaseScraper(ABC):
     async def _async_sleep_with_delay(self) -> None:
         if self.delay > 0:
             await asyncio.sleep(self.delay)
-    
-    @abstractmethod
-    def _make_request(self, url: str, params: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
-
-        pass
\ No newline at end of file
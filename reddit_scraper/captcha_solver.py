@@ -1,13 +1,28 @@
+import asyncio
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import base64
+import functools
+import random
+import itertools
 import logging
-from typing import Dict, Optional, Any, Union
+from typing import Awaitable, Callable, Dict, Iterator, Optional, Any, Tuple, Union
 from urllib.parse import urlparse
 from dataclasses import dataclass
 from enum import Enum
 
-logging.basicConfig(level=logging.INFO)
+from ._compat import DATACLASS_SLOTS, JSONDecodeError, json_loads
+from .rate_limiter import TokenBucket
+from .token_store import TokenStore
+
+try:
+    from pybase64 import b64encode_as_string as _b64encode
+except ImportError:
+    def _b64encode(data: bytes) -> str:
+        return base64.b64encode(data).decode('ascii')
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,7 +36,7 @@ class CaptchaType(Enum):
     RECAPTCHA_V3_ENTERPRISE = "ReCaptchaV3EnterpriseTaskProxyLess"
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class CaptchaSolution:
     success: bool
     solution: Optional[str] = None
@@ -30,16 +45,97 @@ class CaptchaSolution:
     cost: Optional[float] = None
 
 
+TOKEN_CACHEABLE_SOLVERS = frozenset({'solve_recaptcha_v2', 'solve_recaptcha_v3', 'solve_hcaptcha'})
+
+
+def _decorrelated_jitter(previous: float, base: float = 1.0, cap: float = 30.0) -> float:
+    return min(random.uniform(base, previous * 3), cap)
+
+
+def _token_store_key(key: Tuple) -> str:
+    return "|".join("" if part is None else str(part) for part in key)
+
+
+def _poll_delays(initial: float, ceiling: float, factor: float = 1.5) -> Iterator[float]:
+    return (min(initial * factor ** i, ceiling) for i in itertools.count())
+
+
+def _recaptcha_v2_task(website_url: str, website_key: str,
+                       proxy: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    task_data = {
+        "type": CaptchaType.RECAPTCHA_V2.value,
+        "websiteURL": website_url,
+        "websiteKey": website_key
+    }
+    
+    if proxy:
+        task_data.update({
+            "type": "ReCaptchaV2Task", 
+            "proxyType": "http",
+            "proxyAddress": proxy.get("host"),
+            "proxyPort": proxy.get("port"),
+            "proxyLogin": proxy.get("username"),
+            "proxyPassword": proxy.get("password")
+        })
+        
+    return task_data
+
+
+def _recaptcha_v3_task(website_url: str, website_key: str,
+                       action: str = "submit", min_score: float = 0.3) -> Dict[str, Any]:
+    return {
+        "type": CaptchaType.RECAPTCHA_V3.value,
+        "websiteURL": website_url,
+        "websiteKey": website_key,
+        "pageAction": action,
+        "minScore": min_score
+    }
+
+
+def _hcaptcha_task(website_url: str, website_key: str) -> Dict[str, Any]:
+    return {
+        "type": CaptchaType.HCAPTCHA.value,
+        "websiteURL": website_url,
+        "websiteKey": website_key
+    }
+
+
+def _image_task(image_data: Union[str, bytes], case_sensitive: bool = False) -> Dict[str, Any]:
+    return {
+        "type": CaptchaType.IMAGE_TO_TEXT.value,
+        "body": _b64encode(image_data) if isinstance(image_data, bytes) else image_data,
+        "case": case_sensitive
+    }
+
+
+def _solution_token(solution: Dict[str, Any]) -> Optional[str]:
+    return solution.get("gRecaptchaResponse") or solution.get("text") or solution.get("token")
+
+
 class CapsolverAPI:
     
-    def __init__(self, api_key: str, base_url: str = "https://api.capsolver.com"):
+    def __init__(self, api_key: str, base_url: str = "https://api.capsolver.com",
+                 connect_timeout: float = 5.0, read_timeout: float = 30.0):
         self.api_key = api_key
         self.base_url = base_url
+        self.timeout = (connect_timeout, read_timeout)
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/json',
             'User-Agent': 'RedditScraper-Capsolver/1.0'
         })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=20)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+    def close(self) -> None:
+        self.session.close()
+        
+    def __enter__(self) -> "CapsolverAPI":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
         
     def create_task(self, task_data: Dict[str, Any]) -> Optional[str]:
         
@@ -49,20 +145,20 @@ class CapsolverAPI:
         }
         
         try:
-            response = self.session.post(f"{self.base_url}/createTask", json=payload)
+            response = self.session.post(f"{self.base_url}/createTask", json=payload, timeout=self.timeout)
             response.raise_for_status()
             
-            result = response.json()
+            result = json_loads(response.content)
             if result.get("errorId") == 0:
                 task_id = result.get("taskId")
-                logger.info(f"Created captcha task: {task_id}")
+                logger.info("Created captcha task: %s", task_id)
                 return task_id
             else:
-                logger.error(f"Failed to create task: {result.get('errorDescription')}")
+                logger.error("Failed to create task: %s", result.get('errorDescription'))
                 return None
                 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request failed when creating task: {e}")
+        except (requests.exceptions.RequestException, JSONDecodeError) as e:
+            logger.error("Request failed when creating task: %s", e)
             return None
             
     def get_task_result(self, task_id: str) -> Optional[Dict[str, Any]]:
@@ -73,43 +169,44 @@ class CapsolverAPI:
         }
         
         try:
-            response = self.session.post(f"{self.base_url}/getTaskResult", json=payload)
+            response = self.session.post(f"{self.base_url}/getTaskResult", json=payload, timeout=self.timeout)
             response.raise_for_status()
             
-            result = response.json()
+            result = json_loads(response.content)
             if result.get("errorId") == 0:
                 if result.get("status") == "ready":
                     return result.get("solution")
                 elif result.get("status") == "processing":
                     return None 
                 else:
-                    logger.error(f"Task failed: {result.get('errorDescription')}")
+                    logger.error("Task failed: %s", result.get('errorDescription'))
                     return None
             else:
-                logger.error(f"Error getting task result: {result.get('errorDescription')}")
+                logger.error("Error getting task result: %s", result.get('errorDescription'))
                 return None
                 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request failed when getting task result: {e}")
+        except (requests.exceptions.RequestException, JSONDecodeError) as e:
+            logger.error("Request failed when getting task result: %s", e)
             return None
             
-    def solve_captcha_async(self, task_data: Dict[str, Any], 
-                           max_wait_time: int = 120, poll_interval: int = 3) -> CaptchaSolution:
+    def solve_captcha_async(self, task_data: Dict[str, Any], max_wait_time: int = 120,
+                           poll_interval: float = 4.0, initial_poll_interval: float = 0.5) -> CaptchaSolution:
         
         task_id = self.create_task(task_data)
         if not task_id:
             return CaptchaSolution(success=False, error_message="Failed to create task")
             
-        start_time = time.time()
-        while time.time() - start_time < max_wait_time:
-            time.sleep(poll_interval)
+        delays = _poll_delays(initial_poll_interval, poll_interval)
+        start_time = time.monotonic()
+        while time.monotonic() - start_time < max_wait_time:
+            time.sleep(next(delays))
             
             solution = self.get_task_result(task_id)
             if solution:
-                logger.info(f"Captcha solved successfully: {task_id}")
+                logger.info("Captcha solved successfully: %s", task_id)
                 return CaptchaSolution(
                     success=True,
-                    solution=solution.get("gRecaptchaResponse") or solution.get("text") or solution.get("token"),
+                    solution=_solution_token(solution),
                     task_id=task_id
                 )
                 
@@ -121,145 +218,427 @@ class CapsolverAPI:
         
     def solve_recaptcha_v2(self, website_url: str, website_key: str, 
                           proxy: Optional[Dict[str, str]] = None) -> CaptchaSolution:
-        
-        task_data = {
-            "type": CaptchaType.RECAPTCHA_V2.value,
-            "websiteURL": website_url,
-            "websiteKey": website_key
-        }
-        
-        if proxy:
-            task_data.update({
-                "type": "ReCaptchaV2Task", 
-                "proxyType": "http",
-                "proxyAddress": proxy.get("host"),
-                "proxyPort": proxy.get("port"),
-                "proxyLogin": proxy.get("username"),
-                "proxyPassword": proxy.get("password")
-            })
-            
-        return self.solve_captcha_async(task_data)
+        return self.solve_captcha_async(_recaptcha_v2_task(website_url, website_key, proxy))
         
     def solve_recaptcha_v3(self, website_url: str, website_key: str, 
                           action: str = "submit", min_score: float = 0.3) -> CaptchaSolution:
+        return self.solve_captcha_async(_recaptcha_v3_task(website_url, website_key, action, min_score))
         
-        task_data = {
-            "type": CaptchaType.RECAPTCHA_V3.value,
-            "websiteURL": website_url,
-            "websiteKey": website_key,
-            "pageAction": action,
-            "minScore": min_score
-        }
+    def solve_hcaptcha(self, website_url: str, website_key: str) -> CaptchaSolution:
+        return self.solve_captcha_async(_hcaptcha_task(website_url, website_key))
         
-        return self.solve_captcha_async(task_data)
+    def solve_image_captcha(self, image_data: Union[str, bytes], 
+                           case_sensitive: bool = False) -> CaptchaSolution:
+        return self.solve_captcha_async(_image_task(image_data, case_sensitive))
         
-    def solve_hcaptcha(self, website_url: str, website_key: str) -> CaptchaSolution:
+    def get_balance(self) -> Optional[float]:
         
-        task_data = {
-            "type": CaptchaType.HCAPTCHA.value,
-            "websiteURL": website_url,
-            "websiteKey": website_key
-        }
+        payload = {"clientKey": self.api_key}
         
-        return self.solve_captcha_async(task_data)
+        try:
+            response = self.session.post(f"{self.base_url}/getBalance", json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            
+            result = json_loads(response.content)
+            if result.get("errorId") == 0:
+                balance = result.get("balance", 0)
+                logger.info("Account balance: $%s", balance)
+                return float(balance)
+            else:
+                logger.error("Failed to get balance: %s", result.get('errorDescription'))
+                return None
+                
+        except (requests.exceptions.RequestException, JSONDecodeError) as e:
+            logger.error("Request failed when getting balance: %s", e)
+            return None
+
+
+@dataclass
+class _PendingTask:
+    future: asyncio.Future
+    delays: Iterator[float]
+    due: float
+
+
+class AsyncTaskPoller:
+    
+    def __init__(self, fetch_result: Callable[[str], Awaitable[Optional[Dict[str, Any]]]]):
+        self.fetch_result = fetch_result
+        self.pending: Dict[str, _PendingTask] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
         
-    def solve_image_captcha(self, image_data: Union[str, bytes], 
-                           case_sensitive: bool = False) -> CaptchaSolution:
+    def submit(self, task_id: str, delays: Iterator[float]) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending[task_id] = _PendingTask(future, delays, loop.time() + next(delays))
         
-        if isinstance(image_data, bytes):
-            image_b64 = base64.b64encode(image_data).decode('utf-8')
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
         else:
-            image_b64 = image_data
+            self._wakeup.set()
+        return future
+    
+    def discard(self, task_id: str) -> None:
+        self.pending.pop(task_id, None)
+        
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        
+        while self.pending:
+            delay = min(entry.due for entry in self.pending.values()) - loop.time()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            now = loop.time()
+            due = [(task_id, entry) for task_id, entry in self.pending.items() if entry.due <= now]
+            results = await asyncio.gather(
+                *(self.fetch_result(task_id) for task_id, _ in due),
+                return_exceptions=True
+            )
             
-        task_data = {
-            "type": CaptchaType.IMAGE_TO_TEXT.value,
-            "body": image_b64,
-            "case": case_sensitive
+            for (task_id, entry), result in zip(due, results):
+                if entry.future.done():
+                    self.pending.pop(task_id, None)
+                elif isinstance(result, asyncio.CancelledError):
+                    self.pending.pop(task_id, None)
+                    entry.future.cancel()
+                elif isinstance(result, BaseException):
+                    self.pending.pop(task_id, None)
+                    entry.future.set_exception(result)
+                elif result:
+                    self.pending.pop(task_id, None)
+                    entry.future.set_result(result)
+                else:
+                    entry.due = loop.time() + next(entry.delays)
+                    
+    async def close(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        for entry in self.pending.values():
+            entry.future.cancel()
+        self.pending.clear()
+
+
+class AsyncCapsolverAPI:
+    
+    def __init__(self, api_key: str, base_url: str = "https://api.capsolver.com", timeout: int = 30):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self._session = None
+        self.poller = AsyncTaskPoller(self.get_task_result)
+        
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={
+                    'Content-Type': 'application/json',
+                    'User-Agent': 'RedditScraper-Capsolver/1.0'
+                }
+            )
+        return self._session
+    
+    async def close(self) -> None:
+        await self.poller.close()
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        
+    async def create_task(self, task_data: Dict[str, Any]) -> Optional[str]:
+        
+        payload = {
+            "clientKey": self.api_key,
+            "task": task_data
         }
         
-        return self.solve_captcha_async(task_data)
+        try:
+            session = await self._get_session()
+            async with session.post(f"{self.base_url}/createTask", json=payload) as response:
+                response.raise_for_status()
+                result = json_loads(await response.read())
+                
+            if result.get("errorId") == 0:
+                task_id = result.get("taskId")
+                logger.info("Created captcha task: %s", task_id)
+                return task_id
+            else:
+                logger.error("Failed to create task: %s", result.get('errorDescription'))
+                return None
+                
+        except (aiohttp.ClientError, asyncio.TimeoutError, JSONDecodeError) as e:
+            logger.error("Request failed when creating task: %s", e)
+            return None
+            
+    async def get_task_result(self, task_id: str) -> Optional[Dict[str, Any]]:
         
-    def get_balance(self) -> Optional[float]:
+        payload = {
+            "clientKey": self.api_key,
+            "taskId": task_id
+        }
         
-        payload = {"clientKey": self.api_key}
+        try:
+            session = await self._get_session()
+            async with session.post(f"{self.base_url}/getTaskResult", json=payload) as response:
+                response.raise_for_status()
+                result = json_loads(await response.read())
+                
+            if result.get("errorId") == 0:
+                if result.get("status") == "ready":
+                    return result.get("solution")
+                elif result.get("status") == "processing":
+                    return None 
+                else:
+                    logger.error("Task failed: %s", result.get('errorDescription'))
+                    return None
+            else:
+                logger.error("Error getting task result: %s", result.get('errorDescription'))
+                return None
+                
+        except (aiohttp.ClientError, asyncio.TimeoutError, JSONDecodeError) as e:
+            logger.error("Request failed when getting task result: %s", e)
+            return None
+            
+    async def solve_captcha_async(self, task_data: Dict[str, Any], max_wait_time: int = 120,
+                                  poll_interval: float = 4.0, initial_poll_interval: float = 0.5) -> CaptchaSolution:
         
+        task_id = await self.create_task(task_data)
+        if not task_id:
+            return CaptchaSolution(success=False, error_message="Failed to create task")
+            
+        future = self.poller.submit(task_id, _poll_delays(initial_poll_interval, poll_interval))
         try:
-            response = self.session.post(f"{self.base_url}/getBalance", json=payload)
-            response.raise_for_status()
+            solution = await asyncio.wait_for(future, max_wait_time)
+        except asyncio.TimeoutError:
+            return CaptchaSolution(
+                success=False, 
+                error_message="Timeout waiting for captcha solution",
+                task_id=task_id
+            )
+        finally:
+            self.poller.discard(task_id)
             
-            result = response.json()
+        logger.info("Captcha solved successfully: %s", task_id)
+        return CaptchaSolution(
+            success=True,
+            solution=_solution_token(solution),
+            task_id=task_id
+        )
+        
+    async def solve_recaptcha_v2(self, website_url: str, website_key: str, 
+                                 proxy: Optional[Dict[str, str]] = None) -> CaptchaSolution:
+        return await self.solve_captcha_async(_recaptcha_v2_task(website_url, website_key, proxy))
+        
+    async def solve_recaptcha_v3(self, website_url: str, website_key: str, 
+                                 action: str = "submit", min_score: float = 0.3) -> CaptchaSolution:
+        return await self.solve_captcha_async(_recaptcha_v3_task(website_url, website_key, action, min_score))
+        
+    async def solve_hcaptcha(self, website_url: str, website_key: str) -> CaptchaSolution:
+        return await self.solve_captcha_async(_hcaptcha_task(website_url, website_key))
+        
+    async def solve_image_captcha(self, image_data: Union[str, bytes], 
+                                  case_sensitive: bool = False) -> CaptchaSolution:
+        return await self.solve_captcha_async(_image_task(image_data, case_sensitive))
+        
+    async def get_balance(self) -> Optional[float]:
+        
+        payload = {"clientKey": self.api_key}
+        
+        try:
+            session = await self._get_session()
+            async with session.post(f"{self.base_url}/getBalance", json=payload) as response:
+                response.raise_for_status()
+                result = json_loads(await response.read())
+                
             if result.get("errorId") == 0:
                 balance = result.get("balance", 0)
-                logger.info(f"Account balance: ${balance}")
+                logger.info("Account balance: $%s", balance)
                 return float(balance)
             else:
-                logger.error(f"Failed to get balance: {result.get('errorDescription')}")
+                logger.error("Failed to get balance: %s", result.get('errorDescription'))
                 return None
                 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request failed when getting balance: {e}")
+        except (aiohttp.ClientError, asyncio.TimeoutError, JSONDecodeError) as e:
+            logger.error("Request failed when getting balance: %s", e)
             return None
 
 
 class CaptchaSolverManager: 
     
-    def __init__(self, captcha_config_or_api_key, max_retries: int = 3, site_keys: Optional[Dict[str, str]] = None):
+    def __init__(self, captcha_config_or_api_key, max_retries: int = 3, site_keys: Optional[Dict[str, str]] = None,
+                 token_ttl: float = 110, max_concurrent: int = 20, requests_per_second: float = 10.0,
+                 token_store: Optional[TokenStore] = None, balance_ttl: float = 30.0):
         if hasattr(captcha_config_or_api_key, 'api_key'):  
             config = captcha_config_or_api_key
-            self.solver = CapsolverAPI(config.api_key)
-            self.max_retries = max_retries
-            self.site_keys = config.site_keys or {}
+            api_key = config.api_key
+            site_keys = config.site_keys
         else:  
             api_key = captcha_config_or_api_key
-            self.solver = CapsolverAPI(api_key)
-            self.max_retries = max_retries
-            self.site_keys = site_keys or {}
-    
-    def get_site_key(self, url: str) -> Optional[str]:
-        try:
-            parsed_url = urlparse(url)
-            domain = parsed_url.netloc
-
-            if domain in self.site_keys:
-                return self.site_keys[domain]
-            
-            if domain.startswith('www.'):
-                base_domain = domain[4:]
-                if base_domain in self.site_keys:
-                    return self.site_keys[base_domain]
             
-            www_domain = f"www.{domain}"
-            if www_domain in self.site_keys:
-                return self.site_keys[www_domain]
-                
-            logger.warning(f"No site key configured for domain: {domain}")
+        self.solver = CapsolverAPI(api_key)
+        self.async_solver = AsyncCapsolverAPI(api_key)
+        self.max_retries = max_retries
+        self.site_keys = site_keys or {}
+        self._token_ttl = token_ttl
+        self._token_cache: Dict[Tuple, Tuple[float, CaptchaSolution]] = {}
+        self.token_store = token_store
+        self.max_concurrent = max_concurrent
+        self.rate_limiter = TokenBucket(requests_per_second)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._balance_ttl = balance_ttl
+        self._balance_cache: Optional[float] = None
+        self._balance_ts = 0.0
+        self._balance_task: Optional[asyncio.Task] = None
+    
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+    
+    def _token_cache_key(self, solve_func, args: tuple, kwargs: Dict[str, Any]) -> Optional[Tuple]:
+        name = getattr(solve_func, '__name__', None)
+        if name not in TOKEN_CACHEABLE_SOLVERS:
+            return None
+        
+        website_url = kwargs.get('website_url', args[0] if args else None)
+        website_key = kwargs.get('website_key', args[1] if len(args) > 1 else None)
+        if not website_url or not website_key:
             return None
+        
+        action = None
+        if name == 'solve_recaptcha_v3':
+            action = kwargs.get('action', args[2] if len(args) > 2 else 'submit')
+        
+        return (name, urlparse(website_url).netloc, website_key, action)
+    
+    def _get_cached_token(self, key: Optional[Tuple]) -> Optional[CaptchaSolution]:
+        if key is None:
+            return None
+        
+        entry = self._token_cache.get(key)
+        if entry is not None:
+            solved_at, solution = entry
+            if time.monotonic() - solved_at < self._token_ttl:
+                logger.info("Reusing cached captcha token for %s", key[1])
+                return solution
             
+            self._token_cache.pop(key, None)
+        
+        return self._get_stored_token(key)
+    
+    def _get_stored_token(self, key: Tuple) -> Optional[CaptchaSolution]:
+        if self.token_store is None:
+            return None
+        
+        try:
+            stored = self.token_store.get(_token_store_key(key))
         except Exception as e:
-            logger.error(f"Error parsing URL {url}: {e}")
+            logger.warning("Token store lookup failed: %s", e)
+            return None
+        
+        if stored is None:
+            return None
+        
+        expires_at, token = stored
+        solution = CaptchaSolution(success=True, solution=token)
+        remaining = min(expires_at - time.time(), self._token_ttl)
+        self._token_cache[key] = (time.monotonic() - (self._token_ttl - remaining), solution)
+        logger.info("Reusing stored captcha token for %s", key[1])
+        return solution
+    
+    def _cache_token(self, key: Optional[Tuple], solution: CaptchaSolution) -> None:
+        if key is None or not solution.success:
+            return
+        
+        self._token_cache[key] = (time.monotonic(), solution)
+        if self.token_store is not None and solution.solution:
+            try:
+                self.token_store.set(_token_store_key(key), solution.solution, self._token_ttl)
+            except Exception as e:
+                logger.warning("Token store write failed: %s", e)
+    
+    def mark_token_invalid(self, solve_func, *args, **kwargs) -> None:
+        key = self._token_cache_key(solve_func, args, kwargs)
+        if key is None:
+            return
+        
+        self._token_cache.pop(key, None)
+        if self.token_store is not None:
+            try:
+                self.token_store.delete(_token_store_key(key))
+            except Exception as e:
+                logger.warning("Token store delete failed: %s", e)
+    
+    @property
+    def site_keys(self) -> Dict[str, str]:
+        return self._site_keys
+    
+    @site_keys.setter
+    def site_keys(self, site_keys: Dict[str, str]) -> None:
+        self._site_keys = site_keys
+        
+        normalized = dict(site_keys)
+        for domain, key in site_keys.items():
+            alias = domain[4:] if domain.startswith('www.') else f"www.{domain}"
+            normalized.setdefault(alias, key)
+        self._normalized_site_keys = normalized
+        self._site_key_for_url = functools.lru_cache(maxsize=1024)(self._lookup_site_key)
+    
+    def _lookup_site_key(self, url: str) -> Optional[str]:
+        domain = urlparse(url).netloc
+        site_key = self._normalized_site_keys.get(domain)
+        if site_key is None:
+            logger.warning("No site key configured for domain: %s", domain)
+        return site_key
+    
+    def get_site_key(self, url: str) -> Optional[str]:
+        try:
+            return self._site_key_for_url(url)
+        except Exception as e:
+            logger.error("Error parsing URL %s: %s", url, e)
             return None
         
     def solve_with_retry(self, solve_func, *args, **kwargs) -> CaptchaSolution:
         
+        cache_key = self._token_cache_key(solve_func, args, kwargs)
+        cached = self._get_cached_token(cache_key)
+        if cached:
+            return cached
+        
         last_error = None
+        wait_time = 1.0
         
         for attempt in range(self.max_retries + 1):
             if attempt > 0:
-                wait_time = 2 ** attempt  
-                logger.info(f"Retrying captcha solve in {wait_time} seconds (attempt {attempt + 1}/{self.max_retries + 1})")
+                wait_time = _decorrelated_jitter(wait_time)
+                logger.info("Retrying captcha solve in %.1f seconds (attempt %s/%s)", wait_time, attempt + 1, self.max_retries + 1)
                 time.sleep(wait_time)
                 
             try:
                 solution = solve_func(*args, **kwargs)
                 if solution.success:
+                    self._cache_token(cache_key, solution)
                     return solution
                 else:
                     last_error = solution.error_message
-                    logger.warning(f"Captcha solve attempt {attempt + 1} failed: {last_error}")
+                    logger.warning("Captcha solve attempt %s failed: %s", attempt + 1, last_error)
                     
             except Exception as e:
                 last_error = str(e)
-                logger.error(f"Exception during captcha solve attempt {attempt + 1}: {e}")
+                logger.error("Exception during captcha solve attempt %s: %s", attempt + 1, e)
                 
         return CaptchaSolution(
             success=False,
@@ -268,29 +647,123 @@ class CaptchaSolverManager:
         
     def check_balance_and_solve(self, solve_func, *args, **kwargs) -> CaptchaSolution:
         
-        balance = self.solver.get_balance()
+        cached = self._get_cached_token(self._token_cache_key(solve_func, args, kwargs))
+        if cached:
+            return cached
+        
+        balance = self._get_balance()
         if balance is None:
             return CaptchaSolution(success=False, error_message="Failed to check account balance")
         elif balance < 0.01:  
             return CaptchaSolution(success=False, error_message=f"Insufficient balance: ${balance}")
             
-        logger.info(f"Account balance: ${balance} - proceeding with captcha solve")
+        logger.info("Account balance: $%s - proceeding with captcha solve", balance)
         return self.solve_with_retry(solve_func, *args, **kwargs)
+        
+    def _store_balance(self, balance: Optional[float]) -> None:
+        if balance is not None:
+            self._balance_cache = balance
+            self._balance_ts = time.monotonic()
+    
+    def _get_balance(self) -> Optional[float]:
+        if self._balance_cache is None or time.monotonic() - self._balance_ts >= self._balance_ttl:
+            self._store_balance(self.solver.get_balance())
+        return self._balance_cache
+    
+    async def _refresh_balance_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._balance_ttl)
+            self._store_balance(await self.async_solver.get_balance())
+    
+    async def _get_balance_async(self) -> Optional[float]:
+        if self._balance_cache is None:
+            self._store_balance(await self.async_solver.get_balance())
+        
+        if self._balance_task is None or self._balance_task.done():
+            self._balance_task = asyncio.ensure_future(self._refresh_balance_loop())
+        
+        return self._balance_cache
+    
+    async def solve_with_retry_async(self, solve_func, *args, **kwargs) -> CaptchaSolution:
+        
+        cache_key = self._token_cache_key(solve_func, args, kwargs)
+        cached = self._get_cached_token(cache_key)
+        if cached:
+            return cached
+        
+        last_error = None
+        wait_time = 1.0
+        
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                wait_time = _decorrelated_jitter(wait_time)
+                logger.info("Retrying captcha solve in %.1f seconds (attempt %s/%s)", wait_time, attempt + 1, self.max_retries + 1)
+                await asyncio.sleep(wait_time)
+                
+            try:
+                async with self.semaphore:
+                    await self.rate_limiter.acquire()
+                    solution = await solve_func(*args, **kwargs)
+                if solution.success:
+                    self._cache_token(cache_key, solution)
+                    return solution
+                else:
+                    last_error = solution.error_message
+                    logger.warning("Captcha solve attempt %s failed: %s", attempt + 1, last_error)
+                    
+            except Exception as e:
+                last_error = str(e)
+                logger.error("Exception during captcha solve attempt %s: %s", attempt + 1, e)
+                
+        return CaptchaSolution(
+            success=False,
+            error_message=f"Failed after {self.max_retries + 1} attempts. Last error: {last_error}"
+        )
+        
+    async def check_balance_and_solve_async(self, solve_func, *args, **kwargs) -> CaptchaSolution:
+        
+        cached = self._get_cached_token(self._token_cache_key(solve_func, args, kwargs))
+        if cached:
+            return cached
+        
+        balance = await self._get_balance_async()
+        if balance is None:
+            return CaptchaSolution(success=False, error_message="Failed to check account balance")
+        elif balance < 0.01:  
+            return CaptchaSolution(success=False, error_message=f"Insufficient balance: ${balance}")
+            
+        logger.info("Account balance: $%s - proceeding with captcha solve", balance)
+        return await self.solve_with_retry_async(solve_func, *args, **kwargs)
+        
+    async def close(self) -> None:
+        if self._balance_task is not None:
+            self._balance_task.cancel()
+            try:
+                await self._balance_task
+            except asyncio.CancelledError:
+                pass
+            self._balance_task = None
+        
+        self.solver.close()
+        await self.async_solver.close()
+        if self.token_store is not None:
+            self.token_store.close()
 
 
-def create_default_captcha_solver() -> CaptchaSolverManager:
+@functools.lru_cache(maxsize=8)
+def create_default_captcha_solver(config_path: str = "config.json") -> CaptchaSolverManager:
     
-    from .config import get_config_manager
+    from .config import ConfigManager
     
-    config_manager = get_config_manager("config.json")
+    config_manager = ConfigManager(config_path)
     
     if config_manager.has_captcha_solvers():
         captcha_configs = config_manager.get_captcha_solvers()
         if captcha_configs:
             config = captcha_configs[0]
             return CaptchaSolverManager(
-                api_key=config.api_key,
+                config.api_key,
                 site_keys=config.site_keys or {}
             )
     
-    raise ValueError("No captcha solver API key found in config.json. Please add your API key to the configuration file.")
\ No newline at end of file
+    raise ValueError(f"No captcha solver API key found in {config_path}. Please add your API key to the configuration file.")
\ No newline at end of file
@@ -1,30 +1,48 @@
+import asyncio
+import atexit
 import click
-import json
+import csv
+import functools
 import logging
 import os
 import sys
 import time
-from typing import Optional
+from typing import Any, Callable, Dict, Iterable, Optional
 from datetime import datetime
-import pandas as pd
+from itertools import islice
 from rich.console import Console
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
-from dotenv import load_dotenv
 
+from .base_scraper import PostRow
+from .cli_helpers import spinner
 from .json_scraper import JSONScraper
 from .requests_scraper import RequestsScraper
 from .proxy_manager import ProxyManager
 from .captcha_solver import CaptchaSolverManager
 from .config import get_config_manager, ConfigManager
+from ._compat import json_dumps, new_event_loop, uvloop, write_json_stream
 
 console = Console()
 logger = logging.getLogger(__name__)
 
-load_dotenv()
+_runner = None
 
 
-def setup_advanced_features(config_manager: ConfigManager) -> tuple:
+def _run(coro):
+    global _runner
+    
+    if sys.version_info < (3, 11):
+        if uvloop is not None:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        return asyncio.run(coro)
+    
+    if _runner is None:
+        _runner = asyncio.Runner(loop_factory=new_event_loop)
+        atexit.register(_runner.close)
+    return _runner.run(coro)
+
+
+def build_advanced_features(config_manager: ConfigManager) -> tuple:
     proxy_manager = None
     captcha_solver = None
     
@@ -39,9 +57,8 @@ def setup_advanced_features(config_manager: ConfigManager) -> tuple:
                     proxy_config.password,
                     proxy_config.proxy_type
                 )
-            proxy_manager.health_check_all()
-            console.print("[green]Proxy manager initialized successfully[/green]")
         except Exception as e:
+            proxy_manager = None
             console.print(f"[yellow]Warning: Failed to initialize proxy manager: {e}[/yellow]")
     
     if config_manager.has_captcha_solvers():
@@ -53,32 +70,114 @@ def setup_advanced_features(config_manager: ConfigManager) -> tuple:
                     config.api_key,
                     site_keys=config.site_keys or {}
                 )
-                balance = captcha_solver.solver.get_balance()
-                if balance is not None:
-                    console.print(f"[green]Captcha solver initialized (Balance: ${balance})[/green]")
-                else:
-                    console.print("[yellow]Warning: Could not verify captcha solver balance[/yellow]")
         except Exception as e:
             console.print(f"[yellow]Warning: Failed to initialize captcha solver: {e}[/yellow]")
     
     return proxy_manager, captcha_solver
 
 
-def save_data(data, output_file: str, format: str = "json"):
+def verify_advanced_features(proxy_manager: Optional[ProxyManager], captcha_solver: Optional[CaptchaSolverManager]) -> None:
+    if proxy_manager:
+        try:
+            proxy_manager.health_check_all()
+            console.print("[green]Proxy manager initialized successfully[/green]")
+        except Exception as e:
+            console.print(f"[yellow]Warning: Failed to initialize proxy manager: {e}[/yellow]")
+    
+    if captcha_solver:
+        try:
+            balance = captcha_solver.solver.get_balance()
+            if balance is not None:
+                console.print(f"[green]Captcha solver initialized (Balance: ${balance})[/green]")
+            else:
+                console.print("[yellow]Warning: Could not verify captcha solver balance[/yellow]")
+        except Exception as e:
+            console.print(f"[yellow]Warning: Failed to initialize captcha solver: {e}[/yellow]")
+
+
+@functools.lru_cache(maxsize=4)
+def setup_advanced_features(config_manager: ConfigManager) -> tuple:
+    proxy_manager, captcha_solver = build_advanced_features(config_manager)
+    verify_advanced_features(proxy_manager, captcha_solver)
+    return proxy_manager, captcha_solver
+
+
+def _flatten(record: Dict[str, Any], prefix: str = '', sep: str = '.', out: Optional[Dict[str, Any]] = None,
+             encoder: Optional[Callable[[Any], Any]] = None) -> Dict[str, Any]:
+    
+    if out is None:
+        out = {}
+    
+    for key, value in record.items():
+        name = f"{prefix}{sep}{key}" if prefix else key
+        if isinstance(value, dict):
+            _flatten(value, name, sep, out, encoder)
+        elif encoder is not None and isinstance(value, list):
+            out[name] = encoder(value)
+        else:
+            out[name] = value
+    
+    return out
+
+
+def _json_cell(value: Any) -> str:
+    return json_dumps(value, default=str).decode('utf-8')
+
+
+def save_data(data, output_file: str, format: str = "json", encoder: Optional[Callable[[Any], Any]] = None):
     if format == "json":
-        with open(output_file, 'w') as f:
-            import json as json_module
-            json_module.dump(data, f, indent=2, default=str)
+        with open(output_file, 'wb') as f:
+            f.write(json_dumps(data, indent=True, default=str))
     elif format == "csv":
         if isinstance(data, list) and data:
-            df = pd.json_normalize(data)
-            df.to_csv(output_file, index=False)
+            if any(isinstance(value, (dict, list)) for row in data for value in row.values()):
+                data = [_flatten(record, encoder=encoder or _json_cell) for record in data]
+            fieldnames = list(dict.fromkeys(key for row in data for key in row))
+            with open(output_file, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(data)
         else:
             console.print("[red]Cannot save empty data or non-list data to CSV[/red]")
             return
     console.print(f"[green]Data saved to {output_file}[/green]")
 
 
+def stream_data(records: Iterable[Dict[str, Any]], output_file: str, format: str = "json",
+                encoder: Optional[Callable[[Any], Any]] = None) -> int:
+    count = 0
+    
+    if format == "json":
+        with open(output_file, 'wb') as f:
+            count = write_json_stream(records, f, default=str)
+    elif format == "csv":
+        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            writer = None
+            dropped = set()
+            for record in records:
+                row = _flatten(record, encoder=encoder or _json_cell)
+                if writer is None:
+                    fieldnames = [key for key in PostRow._fields if key in row]
+                    fieldnames.extend(key for key in row if key not in PostRow._fields)
+                    columns = frozenset(fieldnames)
+                    writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+                    writer.writeheader()
+                elif not columns.issuperset(row):
+                    dropped.update(row.keys() - columns)
+                writer.writerow(row)
+                count += 1
+        if dropped:
+            console.print(f"[yellow]Warning: CSV columns are fixed by the first row; dropped keys: "
+                          f"{', '.join(sorted(dropped))}[/yellow]")
+        if not count:
+            os.remove(output_file)
+            console.print("[red]Cannot save empty data or non-list data to CSV[/red]")
+            return count
+    
+    console.print(f"[green]Data saved to {output_file}[/green]")
+    return count
+
+
 @click.group()
 @click.version_option()
 def main():
@@ -92,18 +191,18 @@ def main():
     console.print("• [green]User agent rotation[/green] - Realistic browser simulation\n")
 
 
-@main.group()
-def json():
+@main.group(name='json')
+def json_cmd():
     pass
 
 
 
-@main.group()
-def requests():
+@main.group(name='requests')
+def requests_cmd():
     pass
 
 
-@json.command()
+@json_cmd.command()
 @click.argument('subreddit')
 @click.option('--sort', default='hot', help='Sort method (hot, new, top, rising)')
 @click.option('--limit', default=25, help='Number of posts to fetch')
@@ -112,7 +211,7 @@ def requests():
 @click.option('--config', '-c', help='Path to configuration file')
 @click.option('--delay', default=1.0, help='Delay between requests (seconds)')
 def subreddit(subreddit, sort, limit, output, format, config, delay):
-    import asyncio
+    from .cli_helpers import build_preview_table
     
     async def _async_subreddit():
         config_manager = get_config_manager(config)
@@ -125,10 +224,9 @@ def subreddit(subreddit, sort, limit, output, format, config, delay):
             rotate_user_agents=config_manager.get_scraping_config().rotate_user_agents
         )
         
-        with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-            task = progress.add_task(f"Scraping r/{subreddit}...", total=None)
-            posts = await scraper.scrape_subreddit(subreddit, sort, limit)
-            progress.update(task, completed=100)
+        async with scraper:
+            with spinner(f"Scraping r/{subreddit}..."):
+                posts = await scraper.scrape_subreddit(subreddit, sort, limit)
         
         if not posts:
             console.print("[red]No posts found![/red]")
@@ -136,68 +234,46 @@ def subreddit(subreddit, sort, limit, output, format, config, delay):
             
         console.print(f"[green]Found {len(posts)} posts from r/{subreddit}[/green]")
         
-        table = Table(title=f"r/{subreddit} Posts Preview")
-        table.add_column("Title", style="cyan", no_wrap=False, max_width=50)
-        table.add_column("Author", style="magenta")
-        table.add_column("Score", style="green")
-        table.add_column("Comments", style="yellow")
-        
-        for post in posts[:5]:  
-            table.add_row(
-                post.get('title', 'N/A')[:50] + "..." if len(post.get('title', '')) > 50 else post.get('title', 'N/A'),
-                post.get('author', 'N/A'),
-                str(post.get('score', 0)),
-                str(post.get('num_comments', 0))
-            )
-        
-        console.print(table)
+        console.print(build_preview_table(posts, f"r/{subreddit} Posts Preview"))
         
         if output:
             save_data(posts, output, format)
     
-    asyncio.run(_async_subreddit())
+    _run(_async_subreddit())
 
 
-@json.command()
+@json_cmd.command()
 @click.argument('username')
 @click.option('--sort', default='new', help='Sort method (new, hot, top)')
 @click.option('--limit', default=25, help='Number of posts to fetch')
 @click.option('--output', '-o', help='Output file path')
 @click.option('--format', default='json', type=click.Choice(['json', 'csv']), help='Output format')
 def user(username, sort, limit, output, format):
-    import asyncio
     
     async def _async_user():
-        scraper = JSONScraper()
-        
-        with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-            task = progress.add_task(f"Scraping u/{username}...", total=None)
-            posts = await scraper.scrape_user_posts(username, sort, limit)
-            progress.update(task, completed=100)
+        async with JSONScraper() as scraper:
+            with spinner(f"Scraping u/{username}..."):
+                posts = await scraper.scrape_user_posts(username, sort, limit)
         
         console.print(f"[green]Found {len(posts)} posts from u/{username}[/green]")
         
         if output:
             save_data(posts, output, format)
     
-    asyncio.run(_async_user())
+    _run(_async_user())
 
 
-@json.command()
+@json_cmd.command()
 @click.argument('subreddit')
 @click.argument('post_id')
 @click.option('--sort', default='best', help='Comment sort method')
 @click.option('--output', '-o', help='Output file path')
 def comments(subreddit, post_id, sort, output):
-    import asyncio
     
     async def _async_comments():
-        scraper = JSONScraper()
-        
-        with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-            task = progress.add_task("Scraping comments...", total=None)
-            data = await scraper.scrape_post_comments(subreddit, post_id, sort)
-            progress.update(task, completed=100)
+        async with JSONScraper() as scraper:
+            with spinner("Scraping comments..."):
+                data = await scraper.scrape_post_comments(subreddit, post_id, sort)
         
         if data:
             console.print(f"[green]Found {len(data.get('comments', []))} comments[/green]")
@@ -206,40 +282,42 @@ def comments(subreddit, post_id, sort, output):
         else:
             console.print("[red]No comments found![/red]")
     
-    asyncio.run(_async_comments())
+    _run(_async_comments())
 
 
-@json.command()
+@json_cmd.command()
 @click.argument('subreddit')
 @click.option('--limit', default=25, help='Number of posts to scrape')
 @click.option('--sort', default='hot', help='Sort method (hot, new, top, rising)')
 @click.option('--include-comments', is_flag=True, help='Include comments for each post')
 @click.option('--comment-limit', default=50, help='Max comments per post')
 @click.option('--comment-sort', default='best', help='Comment sort method')
+@click.option('--concurrency', default=8, type=click.IntRange(min=1), help='Max concurrent comment fetches')
 @click.option('--config', '-c', help='Path to configuration file')
 @click.option('--output', '-o', help='Output file path')
-def subreddit_with_comments(subreddit, limit, sort, include_comments, comment_limit, comment_sort, config, output):
-    import asyncio
+def subreddit_with_comments(subreddit, limit, sort, include_comments, comment_limit, comment_sort, concurrency, config, output):
     from .cli_helpers import create_scraper_with_config, scrape_posts_with_progress, add_comments_to_posts, display_scraping_results
     
     async def _async_scrape():
         config_manager = get_config_manager(config) if config else None
         scraper, _ = create_scraper_with_config(config_manager)
         
-        posts = await scrape_posts_with_progress(scraper, subreddit, sort, limit)
-        
-        if include_comments and posts:
-            await add_comments_to_posts(scraper, posts, subreddit, comment_sort, comment_limit)
+        async with scraper:
+            posts = await scrape_posts_with_progress(scraper, subreddit, sort, limit)
+            
+            if include_comments and posts:
+                await add_comments_to_posts(scraper, posts, subreddit, comment_sort, comment_limit,
+                                            concurrency=concurrency, delay=scraper.delay)
         
         if posts and output:
             save_data(posts, output)
         
         display_scraping_results(posts, subreddit, include_comments, output)
     
-    asyncio.run(_async_scrape())
+    _run(_async_scrape())
 
 
-@requests.command()
+@requests_cmd.command()
 @click.argument('subreddit')
 @click.option('--sort', default='hot', help='Sort method')
 @click.option('--max-posts', default=1000, help='Maximum posts to fetch')
@@ -247,18 +325,15 @@ def subreddit_with_comments(subreddit, limit, sort, include_comments, comment_li
 @click.option('--format', default='json', type=click.Choice(['json', 'csv']), help='Output format')
 def paginated(subreddit, sort, max_posts, output, format):
     scraper = RequestsScraper()
+    posts = islice(scraper.scrape_subreddit_paginated(subreddit, sort, max_posts), max_posts)
     
-    posts = []
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-        task = progress.add_task(f"Scraping r/{subreddit} with pagination...", total=None)
-        for post in scraper.scrape_subreddit_paginated(subreddit, sort, max_posts):
-            posts.append(post)
-        progress.update(task, completed=100)
-    
-    console.print(f"[green]Found {len(posts)} posts from r/{subreddit}[/green]")
+    with spinner(f"Scraping r/{subreddit} with pagination..."):
+        if output:
+            count = stream_data(posts, output, format)
+        else:
+            count = sum(1 for _ in posts)
     
-    if output:
-        save_data(posts, output, format)
+    console.print(f"[green]Found {count} posts from r/{subreddit}[/green]")
 
 
 @main.command()
@@ -268,32 +343,29 @@ def paginated(subreddit, sort, max_posts, output, format):
 @click.option('--limit', default=100, help='Number of results')
 @click.option('--output', '-o', help='Output file path')
 def search(query, subreddit, method, limit, output):
-    import asyncio
     
     async def _async_search():
         if method == 'json':
-            scraper = JSONScraper()
-            if subreddit:
-                results = await scraper.search_subreddit(subreddit, query, limit=limit)
-            else:
+            if not subreddit:
                 console.print("[red]JSON method requires a specific subreddit for search[/red]")
                 return
+            async with JSONScraper() as scraper:
+                results = await scraper.search_subreddit(subreddit, query, limit=limit)
         else:  
             scraper = RequestsScraper()
-            results = list(scraper.search_advanced(query, subreddit, max_results=limit))
+            results = list(islice(scraper.search_advanced(query, subreddit, max_results=limit), limit))
         
         console.print(f"[green]Found {len(results)} results for '{query}'[/green]")
         
         if output:
             save_data(results, output)
     
-    asyncio.run(_async_search())
+    _run(_async_search())
 
 
 @main.command()
 @click.option('--config', '-c', help='Path to configuration file')
 def interactive(config):
-    import asyncio
     from .cli_helpers import (
         validate_and_display_config_status, gather_interactive_input, 
         display_scraping_plan, execute_scraping_job, create_interactive_preview_table
@@ -323,7 +395,7 @@ def interactive(config):
         else:
             console.print("[red]No posts were scraped. Check your configuration and try again.[/red]")
     
-    asyncio.run(_async_interactive())
+    _run(_async_interactive())
 
 
 
@@ -332,12 +404,30 @@ def interactive(config):
 def status(config):
     console.print("[bold]Checking Advanced Features Status...[/bold]\n")
     
-    try:
-        config_manager = get_config_manager(config)
-        proxy_manager, _ = setup_advanced_features(config_manager)
-        if not proxy_manager:
-            console.print("[yellow]No proxies configured[/yellow]\\n")
-            return
+    config_manager = get_config_manager(config)
+    proxy_manager, captcha_solver = build_advanced_features(config_manager)
+    
+    async def _check_balance():
+        try:
+            return await captcha_solver.async_solver.get_balance()
+        finally:
+            await captcha_solver.async_solver.close()
+    
+    async def _run_checks():
+        return await asyncio.gather(
+            proxy_manager.health_check_all_async() if proxy_manager else asyncio.sleep(0),
+            _check_balance() if captcha_solver else asyncio.sleep(0),
+            return_exceptions=True
+        )
+    
+    with spinner("Checking advanced features..."):
+        proxy_result, balance = _run(_run_checks())
+    
+    if not proxy_manager:
+        console.print("[yellow]No proxies configured[/yellow]\n")
+    elif isinstance(proxy_result, Exception):
+        console.print(f"[red]Error checking proxy status: {proxy_result}[/red]\n")
+    else:
         stats = proxy_manager.get_proxy_stats()
         
         table = Table(title="Proxy Status")
@@ -361,29 +451,19 @@ def status(config):
         
         console.print(table)
         console.print(f"Overall Health Rate: {stats['health_rate']:.1f}%\n")
-        
-    except Exception as e:
-        console.print(f"[red]Error checking proxy status: {e}[/red]\n")
     
-    try:
-        config_manager = get_config_manager(config)
-        _, captcha_solver = setup_advanced_features(config_manager)
-        if not captcha_solver:
-            console.print("[yellow]No captcha solvers configured[/yellow]")
-            return
-        balance = captcha_solver.solver.get_balance()
+    if not captcha_solver:
+        console.print("[yellow]No captcha solvers configured[/yellow]")
+    elif isinstance(balance, Exception):
+        console.print(f"[red]Error checking captcha solver status: {balance}[/red]")
+    elif balance is not None:
+        console.print(f"[green]Captcha Solver Status: Active[/green]")
+        console.print(f"[green]Balance: ${balance}[/green]")
         
-        if balance is not None:
-            console.print(f"[green]Captcha Solver Status: Active[/green]")
-            console.print(f"[green]Balance: ${balance}[/green]")
-            
-            if balance < 1.0:
-                console.print("[yellow]Warning: Low balance, consider topping up[/yellow]")
-        else:
-            console.print("[red]Captcha Solver Status: Error getting balance[/red]")
-            
-    except Exception as e:
-        console.print(f"[red]Error checking captcha solver status: {e}[/red]")
+        if balance < 1.0:
+            console.print("[yellow]Warning: Low balance, consider topping up[/yellow]")
+    else:
+        console.print("[red]Captcha Solver Status: Error getting balance[/red]")
 
 
 @main.command()
@@ -394,15 +474,18 @@ def test_proxies(config, test_urls):
     
     try:
         config_manager = get_config_manager(config)
-        proxy_manager, _ = setup_advanced_features(config_manager)
+        proxy_manager, _ = build_advanced_features(config_manager)
         if not proxy_manager:
             console.print("[yellow]No proxies configured for testing[/yellow]")
             return
         
-        with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-            task = progress.add_task("Testing proxies...", total=None)
-            proxy_manager.health_check_all()
-            progress.update(task, completed=100)
+        from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
+        
+        with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), BarColumn()) as progress:
+            task = progress.add_task("Testing proxies...", total=len(proxy_manager.proxies))
+            _run(proxy_manager.health_check_all_async(
+                on_checked=lambda proxy, healthy: progress.update(task, advance=1)
+            ))
         
         stats = proxy_manager.get_proxy_stats()
         console.print(f"[green]Proxy test complete![/green]")
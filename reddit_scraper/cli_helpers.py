@@ -1,19 +1,36 @@
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+import operator
+import sys
+from contextlib import contextmanager
+from itertools import islice
+from typing import Iterator, List, Dict, Any, Optional, Sequence, Tuple
 from rich.console import Console
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 
 from .json_scraper import JSONScraper
 from .requests_scraper import RequestsScraper
 from .config import ConfigManager
+from .rate_limiter import TokenBucket
 from .validation import validate_subreddit_name, validate_limit, ValidationError
 
 logger = logging.getLogger(__name__)
 console = Console()
 
 
+@contextmanager
+def spinner(description: str) -> Iterator[None]:
+    if not sys.stdout.isatty():
+        yield
+        return
+    
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    
+    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
+        progress.add_task(description, total=None)
+        yield
+
+
 def create_scraper_with_config(config_manager: Optional[ConfigManager] = None) -> Tuple[JSONScraper, Optional[ConfigManager]]:
 
     from .cli import setup_advanced_features  
@@ -44,21 +61,45 @@ async def scrape_posts_with_progress(scraper: JSONScraper, subreddit: str,
         console.print(f"[red]Validation error: {e}[/red]")
         return []
     
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-        task = progress.add_task(f"Scraping r/{subreddit}...", total=None)
+    with spinner(f"Scraping r/{subreddit}..."):
         posts = await scraper.scrape_subreddit(subreddit, sort, limit)
-        progress.update(task, completed=100)
     
     return posts
 
 
 async def add_comments_to_posts(scraper: JSONScraper, posts: List[Dict[str, Any]], 
                                subreddit: str, comment_sort: str, 
-                               comment_limit: Optional[int] = None) -> None:
+                               comment_limit: Optional[int] = None,
+                               concurrency: int = 8, delay: float = 1.0) -> None:
 
     if not posts:
         return
     
+    concurrency = max(1, concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    rate_limiter = TokenBucket(concurrency / delay, burst=concurrency) if delay > 0 else None
+    scrape = scraper.scrape_post_comments
+    
+    async def _add_comments(post: Dict[str, Any]) -> None:
+        comments = []
+        post_id = post.get('id')
+        
+        if post_id:
+            try:
+                async with semaphore:
+                    if rate_limiter:
+                        await rate_limiter.acquire()
+                    comment_data = await scrape(subreddit, post_id, comment_sort)
+                comments = (comment_data or {}).get('comments', [])
+                if comment_limit:
+                    comments = comments[:comment_limit]
+            except Exception as e:
+                logger.warning(f"Failed to get comments for post {post_id}: {e}")
+        
+        post.update(comments=comments, comment_count_scraped=len(comments))
+    
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
+    
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
@@ -67,72 +108,68 @@ async def add_comments_to_posts(scraper: JSONScraper, posts: List[Dict[str, Any]
     ) as progress:
         comment_task = progress.add_task("Adding comments...", total=len(posts))
         
-        for i, post in enumerate(posts):
-            try:
-                if i > 0:
-                    await asyncio.sleep(1) 
-                
-                post_id = post.get('id')
-                if post_id:
-                    comment_data = await scraper.scrape_post_comments(subreddit, post_id, comment_sort)
-                    if comment_data and 'comments' in comment_data:
-                        comments = comment_data['comments']
-                        if comment_limit:
-                            comments = comments[:comment_limit]
-                        post['comments'] = comments
-                        post['comment_count_scraped'] = len(comments)
-                    else:
-                        post['comments'] = []
-                        post['comment_count_scraped'] = 0
-                else:
-                    post['comments'] = []
-                    post['comment_count_scraped'] = 0
-                
-                progress.update(comment_task, advance=1)
-                
-            except Exception as e:
-                logger.warning(f"Failed to get comments for post {post.get('id', 'unknown')}: {e}")
-                post['comments'] = []
-                post['comment_count_scraped'] = 0
-                progress.update(comment_task, advance=1)
+        def advance(_task):
+            progress.update(comment_task, advance=1)
+        
+        tasks = []
+        for post in posts:
+            task = asyncio.ensure_future(_add_comments(post))
+            task.add_done_callback(advance)
+            tasks.append(task)
+        
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 
-def create_posts_table(posts: List[Dict[str, Any]], subreddit: str, 
-                      include_comments: bool = False) -> Table:
+_ROW_DEFAULTS = {'title': 'N/A', 'author': 'N/A', 'score': 0, 'num_comments': 0}
+_get_row = operator.itemgetter(*_ROW_DEFAULTS)
 
-    table_title = f"r/{subreddit} Posts"
-    if include_comments:
-        table_title += " with Comments"
-    
-    table = Table(title=table_title)
-    table.add_column("Title", style="cyan", no_wrap=False, max_width=50)
-    table.add_column("Author", style="magenta")
-    table.add_column("Score", style="green")
-    table.add_column("Comments", style="yellow")
-    
-    if include_comments:
-        table.add_column("Scraped Comments", style="blue")
+
+_PREVIEW_COLUMNS = (
+    ("Title", {'style': "cyan", 'no_wrap': False, 'max_width': 50}),
+    ("Author", {'style': "magenta"}),
+    ("Score", {'style': "green"}),
+    ("Comments", {'style': "yellow"}),
+)
+
+
+def _new_preview_table(title: str, extra: Tuple[Tuple[str, Dict[str, Any]], ...] = ()) -> Table:
+    table = Table(title=title)
+    for header, options in _PREVIEW_COLUMNS + extra:
+        table.add_column(header, **options)
+    return table
+
+
+def _trunc(text: str, n: int = 50) -> str:
+    return text if len(text) <= n else text[:n - 3] + "..."
+
+
+def build_preview_table(posts: List[Dict[str, Any]], title: str,
+                        extra_cols: Sequence[Tuple[str, str, str]] = ()) -> Table:
+
+    table = _new_preview_table(title, tuple((header, {'style': style}) for header, _, style in extra_cols))
     
     for post in posts[:5]:
-        title = post.get('title', 'N/A')
-        if len(title) > 50:
-            title = title[:47] + "..."
-        
-        row = [
-            title,
-            post.get('author', 'N/A'),
-            str(post.get('score', 0)),
-            str(post.get('num_comments', 0))
-        ]
-        
-        if include_comments:
-            row.append(str(post.get('comment_count_scraped', 0)))
-        
-        table.add_row(*row)
+        post_title, author, score, num_comments = _get_row({**_ROW_DEFAULTS, **post})
+        table.add_row(
+            _trunc(post_title),
+            author,
+            str(score),
+            str(num_comments),
+            *(str(post.get(key, 0)) for _, key, _ in extra_cols)
+        )
     
     return table
 
 
+def create_posts_table(posts: List[Dict[str, Any]], subreddit: str, 
+                      include_comments: bool = False) -> Table:
+
+    if include_comments:
+        return build_preview_table(posts, f"r/{subreddit} Posts with Comments",
+                                   (("Scraped Comments", 'comment_count_scraped', "blue"),))
+    return build_preview_table(posts, f"r/{subreddit} Posts")
+
+
 def display_scraping_results(posts: List[Dict[str, Any]], subreddit: str, 
                            include_comments: bool = False, 
                            output_file: Optional[str] = None) -> None:
@@ -166,20 +203,17 @@ async def handle_large_scraping_job(subject: str, post_count: int, sort_method:
             user_agent=scraper_config.user_agent
         )
         
-        with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-            task = progress.add_task(f"Scraping r/{subject} with proxies (large job)...", total=None)
-            posts = await scraper.scrape_subreddit(subject, sort_method, post_count)
-            progress.update(task, completed=100)
+        async with scraper:
+            with spinner(f"Scraping r/{subject} with proxies (large job)..."):
+                posts = await scraper.scrape_subreddit(subject, sort_method, post_count)
     else:
         scraper = RequestsScraper(
             delay=scraper_config.default_delay,
             user_agent=scraper_config.user_agent
         )
         
-        with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-            task = progress.add_task(f"Scraping r/{subject} with pagination...", total=None)
-            posts = list(scraper.scrape_subreddit_paginated(subject, sort_method, post_count))
-            progress.update(task, completed=100)
+        with spinner(f"Scraping r/{subject} with pagination..."):
+            posts = list(islice(scraper.scrape_subreddit_paginated(subject, sort_method, post_count), post_count))
     
     return posts
 
@@ -192,35 +226,15 @@ def handle_regular_scraping_job(subject: str, post_count: int, sort_method: str,
         user_agent=scraper_config.user_agent
     )
     
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-        task = progress.add_task(f"Scraping r/{subject} (direct requests)...", total=None)
-        posts = list(scraper.scrape_subreddit_paginated(subject, sort_method, post_count))
-        progress.update(task, completed=100)
+    with spinner(f"Scraping r/{subject} (direct requests)..."):
+        posts = list(islice(scraper.scrape_subreddit_paginated(subject, sort_method, post_count), post_count))
     
     return posts
 
 
 def create_interactive_preview_table(posts: List[Dict[str, Any]], subject: str) -> Table:
 
-    table = Table(title=f"r/{subject} Posts")
-    table.add_column("Title", style="cyan", no_wrap=False, max_width=50)
-    table.add_column("Author", style="magenta")
-    table.add_column("Score", style="green")
-    table.add_column("Comments", style="yellow")
-    
-    for post in posts[:5]:
-        title = post.get('title', 'N/A')
-        if len(title) > 50:
-            title = title[:47] + "..."
-        
-        table.add_row(
-            title,
-            post.get('author', 'N/A'),
-            str(post.get('score', 0)),
-            str(post.get('num_comments', 0))
-        )
-    
-    return table
+    return build_preview_table(posts, f"r/{subject} Posts")
 
 
 def validate_and_display_config_status(config_manager: ConfigManager) -> bool:
@@ -253,13 +267,14 @@ def gather_interactive_input(config_manager: ConfigManager) -> Dict[str, Any]:
                               type=click.Choice(['hot', 'new', 'top', 'rising']), 
                               default='hot')
     
-    use_proxies = post_count > 100 and config_manager.has_proxies()
+    has_proxies = config_manager.has_proxies()
+    use_proxies = post_count > 100 and has_proxies
     use_captcha = False
     
     if config_manager.has_captcha_solvers():
         use_captcha = click.confirm("Use captcha solving?", default=True)
     
-    if config_manager.has_proxies():
+    if has_proxies:
         proxy_msg = "Yes (automatic for >100 posts)" if use_proxies else "No (automatic for ≤100 posts)"
         click.echo(f"Proxy usage: {proxy_msg}")
     
@@ -297,19 +312,15 @@ async def execute_scraping_job(inputs: Dict[str, Any], config_manager: ConfigMan
     
     proxy_manager, captcha_solver = setup_advanced_features(config_manager)
     scraper_config = config_manager.get_scraping_config()
+    post_count = inputs['post_count']
     
-    use_proxies = inputs['post_count'] > 100 and config_manager.has_proxies()
-    use_captcha = inputs['use_captcha']
+    job_args = (
+        inputs['subject'], post_count, inputs['sort_method'],
+        scraper_config, proxy_manager, captcha_solver,
+        post_count > 100 and proxy_manager is not None, inputs['use_captcha']
+    )
     
-    if inputs['post_count'] > 100:
-        return await handle_large_scraping_job(
-            inputs['subject'], inputs['post_count'], inputs['sort_method'],
-            scraper_config, proxy_manager, captcha_solver,
-            use_proxies, use_captcha
-        )
+    if post_count > 100:
+        return await handle_large_scraping_job(*job_args)
     else:
-        return handle_regular_scraping_job(
-            inputs['subject'], inputs['post_count'], inputs['sort_method'],
-            scraper_config, proxy_manager, captcha_solver,
-            use_proxies, use_captcha
-        )
\ No newline at end of file
+        return handle_regular_scraping_job(*job_args)
\ No newline at end of file
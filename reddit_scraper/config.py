@@ -1,15 +1,29 @@
 import os
-import json
 import logging
+import mmap
+import threading
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
+from ._compat import DATACLASS_SLOTS, gc_paused, json_dumps, json_loads, JSONDecodeError
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+_MMAP_MIN_SIZE = 4096
+
+
+def _read_json_file(path: str) -> Any:
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= _MMAP_MIN_SIZE:
+            return json_loads(f.read())
+        with gc_paused(), mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return json_loads(view)
+
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ProxyConfig:
     host: str
     port: int
@@ -18,14 +32,14 @@ class ProxyConfig:
     proxy_type: str  
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class CaptchaConfig:
     api_key: str
     provider: str = "capsolver"
     site_keys: Optional[Dict[str, str]] = None  
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ScrapingConfig:
     default_delay: float = 1.0
     max_retries: int = 3
@@ -51,96 +65,107 @@ class ConfigManager:
             self._load_from_file()
     
     def _load_from_env(self):
-        self._load_proxies_from_env()
+        env = dict(os.environ)
         
-        self._load_captcha_from_env()
+        self._load_proxies_from_env(env)
         
-        self._load_scraping_from_env()
+        self._load_captcha_from_env(env)
+        
+        self._load_scraping_from_env(env)
     
-    def _load_proxies_from_env(self):
-        proxies_json = os.getenv('PROXIES_JSON')
+    def _load_proxies_from_env(self, env: Dict[str, str]):
+
+        proxies_json = env.get('PROXIES_JSON')
         if proxies_json:
             try:
-                proxy_data = json.loads(proxies_json)
+                proxy_data = json_loads(proxies_json)
                 for proxy in proxy_data:
                     self.proxies.append(ProxyConfig(**proxy))
                 return
-            except (json.JSONDecodeError, TypeError) as e:
+            except (JSONDecodeError, TypeError) as e:
                 logger.warning(f"Failed to parse PROXIES_JSON: {e}")
         
-        http_host = os.getenv('PROXY_HTTP_HOST')
+        http_host = env.get('PROXY_HTTP_HOST')
         if http_host:
             self.proxies.append(ProxyConfig(
                 host=http_host,
-                port=int(os.getenv('PROXY_HTTP_PORT', 8080)),
-                username=os.getenv('PROXY_HTTP_USERNAME', ''),
-                password=os.getenv('PROXY_HTTP_PASSWORD', ''),
+                port=int(env.get('PROXY_HTTP_PORT', 8080)),
+                username=env.get('PROXY_HTTP_USERNAME', ''),
+                password=env.get('PROXY_HTTP_PASSWORD', ''),
                 proxy_type='http'
             ))
         
-        socks_host = os.getenv('PROXY_SOCKS_HOST')
+        socks_host = env.get('PROXY_SOCKS_HOST')
         if socks_host:
             self.proxies.append(ProxyConfig(
                 host=socks_host,
-                port=int(os.getenv('PROXY_SOCKS_PORT', 1080)),
-                username=os.getenv('PROXY_SOCKS_USERNAME', ''),
-                password=os.getenv('PROXY_SOCKS_PASSWORD', ''),
+                port=int(env.get('PROXY_SOCKS_PORT', 1080)),
+                username=env.get('PROXY_SOCKS_USERNAME', ''),
+                password=env.get('PROXY_SOCKS_PASSWORD', ''),
                 proxy_type='socks5'
             ))
     
-    def _load_captcha_from_env(self):
-        captcha_json = os.getenv('CAPTCHA_SOLVERS_JSON')
+    def _load_captcha_from_env(self, env: Dict[str, str]):
+
+        captcha_json = env.get('CAPTCHA_SOLVERS_JSON')
         if captcha_json:
             try:
-                captcha_data = json.loads(captcha_json)
+                captcha_data = json_loads(captcha_json)
                 for captcha in captcha_data:
                     self.captcha_solvers.append(CaptchaConfig(**captcha))
                 return
-            except (json.JSONDecodeError, TypeError) as e:
+            except (JSONDecodeError, TypeError) as e:
                 logger.warning(f"Failed to parse CAPTCHA_SOLVERS_JSON: {e}")
         
-        capsolver_key = os.getenv('CAPSOLVER_API_KEY')
+        capsolver_key = env.get('CAPSOLVER_API_KEY')
         if capsolver_key:
             self.captcha_solvers.append(CaptchaConfig(
                 api_key=capsolver_key,
                 provider='capsolver'
             ))
     
-    def _load_scraping_from_env(self):
-        self.scraping_config.default_delay = float(os.getenv('DEFAULT_DELAY', 1.0))
-        self.scraping_config.max_retries = int(os.getenv('MAX_RETRIES', 3))
-        self.scraping_config.requests_per_minute = int(os.getenv('REQUESTS_PER_MINUTE', 60))
-        self.scraping_config.user_agent = os.getenv('USER_AGENT', 'RedditScraper/1.0.0')
-        self.scraping_config.rotate_user_agents = os.getenv('ROTATE_USER_AGENTS', 'true').lower() == 'true'
+    def _load_scraping_from_env(self, env: Dict[str, str]):
+
+        scraping_config = self.scraping_config
+        scraping_config.default_delay = float(env.get('DEFAULT_DELAY', 1.0))
+        scraping_config.max_retries = int(env.get('MAX_RETRIES', 3))
+        scraping_config.requests_per_minute = int(env.get('REQUESTS_PER_MINUTE', 60))
+        scraping_config.user_agent = env.get('USER_AGENT', 'RedditScraper/1.0.0')
+        scraping_config.rotate_user_agents = env.get('ROTATE_USER_AGENTS', 'true').lower() == 'true'
+    
+    @classmethod
+    def from_dict(cls, config_data: Dict[str, Any]) -> "ConfigManager":
+        manager = cls()
+        manager._apply_config(config_data)
+        return manager
     
     def _load_from_file(self):
         try:
-            with open(self.config_file, 'r') as f:
-                config_data = json.load(f)
-            
-            if 'proxies' in config_data:
-                self.proxies.extend([
-                    ProxyConfig(**proxy) for proxy in config_data['proxies']
-                ])
-            
-            if 'captcha_solvers' in config_data:
-                for captcha_data in config_data['captcha_solvers']:
-                    captcha_config = CaptchaConfig(
-                        api_key=captcha_data['api_key'],
-                        provider=captcha_data.get('provider', 'capsolver'),
-                        site_keys=captcha_data.get('site_keys', {})
-                    )
-                    self.captcha_solvers.append(captcha_config)
-            
-            if 'scraping' in config_data:
-                scraping_data = config_data['scraping']
-                for key, value in scraping_data.items():
-                    if hasattr(self.scraping_config, key):
-                        setattr(self.scraping_config, key, value)
-                        
+            self._apply_config(_read_json_file(self.config_file))
         except Exception as e:
             logger.warning(f"Failed to load config file {self.config_file}: {e}")
     
+    def _apply_config(self, config_data: Dict[str, Any]):
+        if 'proxies' in config_data:
+            self.proxies.extend([
+                ProxyConfig(**proxy) for proxy in config_data['proxies']
+            ])
+        
+        if 'captcha_solvers' in config_data:
+            for captcha_data in config_data['captcha_solvers']:
+                captcha_config = CaptchaConfig(
+                    api_key=captcha_data['api_key'],
+                    provider=captcha_data.get('provider', 'capsolver'),
+                    site_keys=captcha_data.get('site_keys', {})
+                )
+                self.captcha_solvers.append(captcha_config)
+        
+        if 'scraping' in config_data:
+            scraping_data = config_data['scraping']
+            for key, value in scraping_data.items():
+                if hasattr(self.scraping_config, key):
+                    setattr(self.scraping_config, key, value)
+    
     def get_proxies(self) -> List[ProxyConfig]:
         return self.proxies
     
@@ -193,8 +218,8 @@ class ConfigManager:
             }
         }
         
-        with open(file_path, 'w') as f:
-            json.dump(example_config, f, indent=2)
+        with open(file_path, 'wb') as f:
+            f.write(json_dumps(example_config, indent=True))
         
         logger.info(f"Example configuration saved to {file_path}")
     
@@ -226,18 +251,29 @@ class ConfigManager:
         return status
 
 
-_config_manager = None
+_config_managers: Dict[Optional[str], ConfigManager] = {}
+_config_managers_lock = threading.Lock()
+
+
+def _config_key(config_file: Optional[str]) -> Optional[str]:
+    if config_file is None and os.path.exists("config.json"):
+        config_file = "config.json"
+    return os.path.abspath(config_file) if config_file else None
 
 
 def get_config_manager(config_file: Optional[str] = None) -> ConfigManager:
-    global _config_manager
-    if _config_manager is None:
-        if config_file is None and os.path.exists("config.json"):
-            config_file = "config.json"
-        _config_manager = ConfigManager(config_file)
-    return _config_manager
+    key = _config_key(config_file)
+    manager = _config_managers.get(key)
+    if manager is None:
+        with _config_managers_lock:
+            manager = _config_managers.get(key)
+            if manager is None:
+                manager = _config_managers[key] = ConfigManager(key)
+    return manager
 
 
-def reload_config(config_file: Optional[str] = None):
-    global _config_manager
-    _config_manager = ConfigManager(config_file)
\ No newline at end of file
+def reload_config(config_file: Optional[str] = None) -> ConfigManager:
+    key = _config_key(config_file)
+    with _config_managers_lock:
+        manager = _config_managers[key] = ConfigManager(key)
+    return manager
@@ -1,116 +1,182 @@
 import asyncio
 import aiohttp
-import json
 import logging
-from typing import Dict, List, Optional, Any
+import random
+from itertools import islice
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any
 from fake_useragent import UserAgent
 
+from ._compat import gc_paused, json_loads, JSONDecodeError
 from .base_scraper import BaseScraper
 from .proxy_manager import ProxyManager
+from .rate_limiter import TokenBucket
+from .request_batcher import RequestBatcher
 from .captcha_solver import CaptchaSolverManager, CaptchaSolution
 from .validation import (
     validate_subreddit_name, validate_username, validate_post_id,
-    validate_limit, validate_sort_method, validate_url, ValidationError
+    validate_limit, validate_sort_method, ValidationError
 )
 
 logger = logging.getLogger(__name__)
 
+_BACKOFF = tuple(1 << i for i in range(16))
+_MAX_BACKOFF_STEP = len(_BACKOFF) - 1
+_UA_POOL_BITS = 8
+_ua_pool: List[str] = []
+_ua_source: Optional[UserAgent] = None
+
+
+def _random_user_agent() -> str:
+    global _ua_source
+    
+    if len(_ua_pool) >= 1 << _UA_POOL_BITS:
+        return _ua_pool[random.getrandbits(_UA_POOL_BITS)]
+    
+    if _ua_source is None:
+        _ua_source = UserAgent()
+    agent = _ua_source.random
+    _ua_pool.append(agent)
+    return agent
+
 
 class JSONScraper(BaseScraper):
     
+    _BASE_HEADERS = MappingProxyType({
+        'Accept': 'application/json',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'DNT': '1',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1'
+    })
+    _PAGE_SIZE = 100
+    _PREFETCH_PAGES = 3
+    _SUBREDDIT_SORTS = ('hot', 'new', 'top', 'rising')
+    _COMMENT_SORTS = ('best', 'top', 'new', 'controversial', 'old', 'qa')
+    _USER_SORTS = ('new', 'hot', 'top')
+    _SEARCH_SORTS = ('relevance', 'hot', 'top', 'new', 'comments')
+    
     def __init__(self, delay: float = 1.0, user_agent: Optional[str] = None, 
                  proxy_manager: Optional[ProxyManager] = None,
                  captcha_solver: Optional[CaptchaSolverManager] = None,
                  rotate_user_agents: bool = True,
-                 timeout: int = 30):
+                 timeout: int = 30,
+                 connection_limit: int = 100,
+                 batch_interval_ms: float = 0,
+                 retry_delay: float = 1.0):
         super().__init__(delay)
         self.user_agent = user_agent or "RedditScraper/1.0" 
         self.proxy_manager = proxy_manager
         self.captcha_solver = captcha_solver
         self.rotate_user_agents = rotate_user_agents
         self.timeout = timeout
-        self.ua = UserAgent() if rotate_user_agents else None
+        self.connection_limit = connection_limit
         self._session = None
         self._owned_session = False
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self.batch_interval_ms = batch_interval_ms
+        self.retry_delay = retry_delay
+        self._batcher: Optional[RequestBatcher] = None
         
-        self.default_headers = {
-            'User-Agent': self.user_agent if not rotate_user_agents else (self.ua.random if self.ua else self.user_agent),
-            'Accept': 'application/json',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        }
+        self.default_headers = {**self._BASE_HEADERS, 'User-Agent': self.user_agent}
+        self._static_headers = MappingProxyType(self.default_headers)
     
-    def _get_headers(self) -> Dict[str, str]:
-        headers = self.default_headers.copy()
-        if self.rotate_user_agents and self.ua:
-            headers['User-Agent'] = self.ua.random
-        return headers
+    def _get_headers(self) -> Mapping[str, str]:
+        if not self.rotate_user_agents:
+            return self._static_headers
+        return {**self._BASE_HEADERS, 'User-Agent': _random_user_agent()}
     
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
             timeout = aiohttp.ClientTimeout(total=self.timeout)
+            connector = aiohttp.TCPConnector(
+                limit=self.connection_limit,
+                keepalive_timeout=75,
+                ttl_dns_cache=300
+            )
             self._session = aiohttp.ClientSession(
                 timeout=timeout,
-                headers=self._get_headers()
+                connector=connector
             )
             self._owned_session = True
         return self._session
     
     async def close_session(self):
+        if self._batcher is not None:
+            await self._batcher.aclose()
+            self._batcher = None
         if self._owned_session and self._session and not self._session.closed:
             await self._session.close()
             self._session = None
             self._owned_session = False
     
+    async def __aenter__(self) -> "JSONScraper":
+        await self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close_session()
+    
     async def _make_request(self, url: str, params: Optional[Dict] = None, 
                            max_retries: int = 3) -> Optional[Dict[str, Any]]:
 
-        url = validate_url(url)
+        key = (url, tuple(sorted(params.items())) if params else None)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
         
-        proxy_url = None
-        if self.proxy_manager:
-            proxy_dict = self.proxy_manager.get_next_http_proxy()
-            if proxy_dict:
-                proxy_url = proxy_dict.get('http', proxy_dict.get('https'))
+        if self.batch_interval_ms > 0:
+            if self._batcher is None:
+                self._batcher = RequestBatcher(self._fetch, self.batch_interval_ms)
+            task = asyncio.ensure_future(self._batcher.submit(url, params, max_retries=max_retries))
+        else:
+            task = asyncio.ensure_future(self._fetch(url, params, max_retries))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+    
+    async def _fetch(self, url: str, params: Optional[Dict], max_retries: int) -> Optional[Dict[str, Any]]:
+
+        proxy_url = self.proxy_manager.get_next_http_proxy_url() if self.proxy_manager else None
         
         for attempt in range(max_retries + 1):
             try:
                 session = await self._get_session()
-                logger.info(f"Fetching: {url} (attempt {attempt + 1})")
+                logger.info("Fetching: %s (attempt %d)", url, attempt + 1)
                 
-                async with session.get(url, params=params, proxy=proxy_url) as response:
+                async with session.get(url, params=params, headers=self._get_headers(), proxy=proxy_url) as response:
                     if response.status == 200:
-                        data = await response.json()
-                        logger.info(f"Successfully fetched {url}")
+                        body = await response.read()
+                        with gc_paused():
+                            data = json_loads(body)
+                        logger.info("Successfully fetched %s", url)
                         return data
                     elif response.status == 429:
-                        wait_time = 2 ** attempt
-                        logger.warning(f"Rate limited. Waiting {wait_time}s before retry {attempt + 1}")
+                        wait_time = self.retry_delay * _BACKOFF[min(attempt, _MAX_BACKOFF_STEP)]
+                        logger.warning("Rate limited. Waiting %ss before retry %d", wait_time, attempt + 1)
                         await asyncio.sleep(wait_time)
                     else:
-                        logger.warning(f"HTTP {response.status} for {url}")
+                        logger.warning("HTTP %s for %s", response.status, url)
                         return None
                         
             except aiohttp.ClientProxyConnectionError as e:
-                logger.warning(f"Proxy error for {url}: {e}")
+                logger.warning("Proxy error for %s: %s", url, e)
                 if self.proxy_manager and proxy_url:
                     self.proxy_manager.mark_proxy_failed({'http': proxy_url})
                 continue
                 
             except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-                logger.warning(f"Request failed for {url} (attempt {attempt + 1}): {e}")
+                logger.warning("Request failed for %s (attempt %d): %s", url, attempt + 1, e)
                 if attempt < max_retries:
-                    await asyncio.sleep(2 ** attempt)
+                    await asyncio.sleep(self.retry_delay * _BACKOFF[min(attempt, _MAX_BACKOFF_STEP)])
                 continue
                 
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON decode failed for {url}: {e}")
+            except JSONDecodeError as e:
+                logger.error("JSON decode failed for %s: %s", url, e)
                 return None
                 
-        logger.error(f"Failed to fetch {url} after {max_retries + 1} attempts")
+        logger.error("Failed to fetch %s after %d attempts", url, max_retries + 1)
         return None
     
     async def _handle_captcha_async(self, url: str, response_text: str) -> bool:
@@ -127,8 +193,8 @@ class JSONScraper(BaseScraper):
                     logger.error(f"No reCAPTCHA site key configured for {url}")
                     return False
                 
-                solution = self.captcha_solver.check_balance_and_solve(
-                    self.captcha_solver.solver.solve_recaptcha_v2,
+                solution = await self.captcha_solver.check_balance_and_solve_async(
+                    self.captcha_solver.async_solver.solve_recaptcha_v2,
                     url,
                     site_key
                 )
@@ -144,55 +210,83 @@ class JSONScraper(BaseScraper):
             logger.error(f"Error handling captcha: {e}")
             return False
     
+    async def _fetch_listing_pages(self, url: str, limit: int, queue: asyncio.Queue) -> None:
+
+        bucket = TokenBucket(1.0 / self.delay, burst=1) if self.delay > 0 else None
+        after = None
+        remaining = limit
+        
+        try:
+            while remaining > 0:
+                params = {
+                    'limit': min(self._PAGE_SIZE, remaining),
+                    'raw_json': 1
+                }
+                
+                if after:
+                    params['after'] = after
+                
+                if bucket:
+                    await bucket.acquire()
+                data = await self._make_request(url, params)
+                if not data or 'data' not in data:
+                    logger.warning("No more data available or request failed")
+                    break
+                
+                children = data['data'].get('children', [])
+                if not children:
+                    logger.info("No more posts available")
+                    break
+                
+                await queue.put(children)
+                remaining -= sum(1 for child in children if child['kind'] == 't3')
+                
+                after = data['data'].get('after')
+                if not after:
+                    logger.info("Reached end of available posts")
+                    break
+        except Exception:
+            await queue.put(None)
+            raise
+        await queue.put(None)
+    
+    async def _scrape_listing_pages(self, url: str, limit: int) -> List[Dict[str, Any]]:
+
+        posts = []
+        queue = asyncio.Queue(maxsize=self._PREFETCH_PAGES)
+        producer = asyncio.ensure_future(self._fetch_listing_pages(url, limit, queue))
+        
+        try:
+            while (children := await queue.get()) is not None:
+                with gc_paused():
+                    posts.extend(islice(self._clean_listing(children), limit - len(posts)))
+            await producer
+        finally:
+            producer.cancel()
+        return posts
+    
     async def scrape_subreddit(self, subreddit: str, sort_by: str = "hot", 
                               limit: int = 25) -> List[Dict[str, Any]]:
         subreddit = validate_subreddit_name(subreddit)
-        sort_by = validate_sort_method(sort_by, ['hot', 'new', 'top', 'rising'])
+        sort_by = validate_sort_method(sort_by, self._SUBREDDIT_SORTS)
         limit = validate_limit(limit)
-        
+        return await self._scrape_subreddit(subreddit, sort_by, limit)
+    
+    async def _scrape_subreddit(self, subreddit: str, sort_by: str, limit: int) -> List[Dict[str, Any]]:
+
         url = f"https://www.reddit.com/r/{subreddit}/{sort_by}.json"
-        posts = []
-        after = None
-        posts_fetched = 0
-        batch_size = 100  
         
-        while posts_fetched < limit:
-            current_limit = min(batch_size, limit - posts_fetched)
-            
-            params = {
-                'limit': current_limit,
-                'raw_json': 1
-            }
-            
-            if after:
-                params['after'] = after
-                
-            data = await self._make_request(url, params)
+        if limit <= self._PAGE_SIZE:
+            posts = []
+            data = await self._make_request(url, {'limit': limit, 'raw_json': 1})
             if not data or 'data' not in data:
                 logger.warning("No more data available or request failed")
-                break
-                
-            children = data['data'].get('children', [])
-            if not children:
-                logger.info("No more posts available")
-                break
-                
-            for child in children:
-                if child['kind'] == 't3' and posts_fetched < limit:
-                    cleaned_post = self._clean_post_data(child['data'])
-                    posts.append(cleaned_post)
-                    posts_fetched += 1
-                    
-            after = data['data'].get('after')
-            if not after:
-                logger.info("Reached end of available posts")
-                break
-                
-            await asyncio.sleep(self.delay)
+            else:
+                posts = list(islice(self._clean_listing(data['data'].get('children', [])), limit))
+        else:
+            posts = await self._scrape_listing_pages(url, limit)
                     
         logger.info(f"Scraped {len(posts)} posts from r/{subreddit}")
-        
-        await self.close_session()
         return posts
     
     async def scrape_post_comments(self, subreddit: str, post_id: str, 
@@ -200,7 +294,7 @@ class JSONScraper(BaseScraper):
 
         subreddit = validate_subreddit_name(subreddit)
         post_id = validate_post_id(post_id)
-        sort = validate_sort_method(sort, ['best', 'top', 'new', 'controversial', 'old', 'qa'])
+        sort = validate_sort_method(sort, self._COMMENT_SORTS)
         
         url = f"https://www.reddit.com/r/{subreddit}/comments/{post_id}.json"
         params = {'sort': sort} if sort else None
@@ -222,7 +316,7 @@ class JSONScraper(BaseScraper):
                                limit: int = 25) -> List[Dict[str, Any]]:
 
         username = validate_username(username)
-        sort_by = validate_sort_method(sort_by, ['new', 'hot', 'top'])
+        sort_by = validate_sort_method(sort_by, self._USER_SORTS)
         limit = validate_limit(limit)
         
         url = f"https://www.reddit.com/user/{username}/submitted.json"
@@ -238,18 +332,15 @@ class JSONScraper(BaseScraper):
             
         posts = []
         if 'data' in data and 'children' in data['data']:
-            for child in data['data']['children']:
-                if child['kind'] == 't3':
-                    cleaned_post = self._clean_post_data(child['data'])
-                    posts.append(cleaned_post)
-                    
+            posts = list(self._clean_listing(data['data']['children']))
+        
         logger.info(f"Scraped {len(posts)} posts from u/{username}")
         return posts
     
     async def search_subreddit(self, subreddit: str, query: str, sort_by: str = "relevance",
                               time_filter: str = "all", limit: int = 25) -> List[Dict[str, Any]]:
         subreddit = validate_subreddit_name(subreddit)
-        sort_by = validate_sort_method(sort_by, ['relevance', 'hot', 'top', 'new', 'comments'])
+        sort_by = validate_sort_method(sort_by, self._SEARCH_SORTS)
         limit = validate_limit(limit)
         
         if not query.strip():
@@ -270,29 +361,30 @@ class JSONScraper(BaseScraper):
             
         posts = []
         if 'data' in data and 'children' in data['data']:
-            for child in data['data']['children']:
-                if child['kind'] == 't3':
-                    cleaned_post = self._clean_post_data(child['data'])
-                    posts.append(cleaned_post)
-                    
+            posts = list(self._clean_listing(data['data']['children']))
+        
         logger.info(f"Found {len(posts)} posts matching '{query}' in r/{subreddit}")
         return posts
     
     async def scrape_multiple_subreddits(self, subreddits: List[str], 
                                         sort_by: str = "hot", 
-                                        limit_per_subreddit: int = 25) -> Dict[str, List[Dict[str, Any]]]:
+                                        limit_per_subreddit: int = 25,
+                                        max_concurrency: int = 4) -> Dict[str, List[Dict[str, Any]]]:
 
         if not subreddits:
             return {}
         
         validated_subreddits = [validate_subreddit_name(sr) for sr in subreddits]
+        sort_by = validate_sort_method(sort_by, self._SUBREDDIT_SORTS)
+        limit_per_subreddit = validate_limit(limit_per_subreddit)
+        
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
         
-        tasks = [
-            self.scrape_subreddit(subreddit, sort_by, limit_per_subreddit)
-            for subreddit in validated_subreddits
-        ]
+        async def guarded(subreddit: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self._scrape_subreddit(subreddit, sort_by, limit_per_subreddit)
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await asyncio.gather(*map(guarded, validated_subreddits), return_exceptions=True)
         
         final_results = {}
         for subreddit, result in zip(validated_subreddits, results):
@@ -1,18 +1,30 @@
+import asyncio
+import aiohttp
 import requests
 import random
 import time
 import logging
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple, Any
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
 import threading
-from urllib.parse import urlparse
+from operator import attrgetter
+from statistics import median
+
+from ._compat import DATACLASS_SLOTS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_HEALTH_CHECK_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+_PROXY_DETAIL_KEYS = ('host', 'port', 'type', 'is_healthy', 'success_count', 'failure_count', 'last_checked')
+_LATENCY_ALPHA = 0.2
+_proxy_detail_values = attrgetter(
+    'host', 'port', 'proxy_type', 'is_healthy', 'success_count', 'failure_count', 'last_checked'
+)
+
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ProxyConfig:
     host: str
     port: int
@@ -23,6 +35,14 @@ class ProxyConfig:
     last_checked: float = 0
     failure_count: int = 0
     success_count: int = 0
+    latency_ms_ewma: float = 0.0
+    url: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    proxy_dict: Optional[Dict[str, str]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.proxy_type in ("http", "socks5"):
+            self.url = f"{self.proxy_type}://{self.username}:{self.password}@{self.host}:{self.port}"
+            self.proxy_dict = {'http': self.url, 'https': self.url}
 
 
 class ProxyManager:
@@ -30,6 +50,12 @@ class ProxyManager:
     def __init__(self, health_check_interval: int = 300, max_failures: int = 3):
         
         self.proxies: List[ProxyConfig] = []
+        self._healthy: List[ProxyConfig] = []
+        self._healthy_http: List[ProxyConfig] = []
+        self._healthy_weights: Optional[List[float]] = None
+        self._healthy_http_weights: Optional[List[float]] = None
+        self._by_url: Dict[str, ProxyConfig] = {}
+        self._by_host_port: Dict[Tuple[str, int], ProxyConfig] = {}
         self.current_proxy_index = 0
         self.health_check_interval = health_check_interval
         self.max_failures = max_failures
@@ -39,6 +65,11 @@ class ProxyManager:
             "https://api.ipify.org?format=json",
             "http://icanhazip.com"
         ]
+        self._health_url_index = 0
+        self._health_session = requests.Session()
+        self._stop_event = threading.Event()
+        self._monitor_thread: Optional[threading.Thread] = None
+        self._monitor_task: Optional[asyncio.Task] = None
         
     def add_proxy(self, host: str, port: int, username: str, password: str, 
                   proxy_type: str = "http") -> None:
@@ -49,7 +80,12 @@ class ProxyManager:
             password=password,
             proxy_type=proxy_type.lower()
         )
-        self.proxies.append(proxy)
+        with self.lock:
+            self.proxies.append(proxy)
+            self._by_host_port[(host, port)] = proxy
+            if proxy.url:
+                self._by_url[proxy.url] = proxy
+            self._rebuild_healthy()
         logger.info(f"Added {proxy_type.upper()} proxy: {host}:{port}")
         
     def add_proxy_from_string(self, proxy_string: str, proxy_type: str = "http") -> None:
@@ -65,172 +101,268 @@ class ProxyManager:
             logger.error(f"Error parsing proxy string {proxy_string}: {e}")
             
     def get_proxy_dict(self, proxy: ProxyConfig) -> Dict[str, str]:
-        if proxy.proxy_type == "http":
-            proxy_url = f"http://{proxy.username}:{proxy.password}@{proxy.host}:{proxy.port}"
-            return {
-                'http': proxy_url,
-                'https': proxy_url
-            }
-        elif proxy.proxy_type == "socks5":
-            proxy_url = f"socks5://{proxy.username}:{proxy.password}@{proxy.host}:{proxy.port}"
-            return {
-                'http': proxy_url,
-                'https': proxy_url
-            }
-        else:
+        if proxy.proxy_dict is None:
             raise ValueError(f"Unsupported proxy type: {proxy.proxy_type}")
+        return proxy.proxy_dict
+            
+    def _rebuild_healthy(self) -> None:
+        self._healthy = [p for p in self.proxies if p.is_healthy]
+        self._healthy_http = [p for p in self._healthy if p.proxy_type == 'http']
+        self._rebuild_weights()
+        
+    def _rebuild_weights(self) -> None:
+        measured = [p.latency_ms_ewma for p in self._healthy if p.latency_ms_ewma]
+        if not measured:
+            self._healthy_weights = self._healthy_http_weights = None
+            return
+        default = median(measured)
+        self._healthy_weights = [1.0 / max(p.latency_ms_ewma or default, 1.0) for p in self._healthy]
+        self._healthy_http_weights = [1.0 / max(p.latency_ms_ewma or default, 1.0) for p in self._healthy_http]
+        
+    def _pick(self, proxies: List[ProxyConfig], weights: Optional[List[float]]) -> ProxyConfig:
+        if weights is not None:
+            return random.choices(proxies, weights=weights)[0]
+        proxy = proxies[self.current_proxy_index % len(proxies)]
+        self.current_proxy_index = (self.current_proxy_index + 1) % len(proxies)
+        return proxy
+        
+    def _set_healthy(self, proxy: ProxyConfig, healthy: bool) -> None:
+        with self.lock:
+            if proxy.is_healthy != healthy:
+                proxy.is_healthy = healthy
+                self._rebuild_healthy()
             
     def get_next_proxy(self) -> Optional[Dict[str, str]]:
         with self.lock:
             if not self.proxies:
                 return None
                 
-            healthy_proxies = [p for p in self.proxies if p.is_healthy]
+            healthy_proxies = self._healthy
             if not healthy_proxies:
                 logger.warning("No healthy proxies available!")
                 return None
                 
-            proxy = healthy_proxies[self.current_proxy_index % len(healthy_proxies)]
-            self.current_proxy_index = (self.current_proxy_index + 1) % len(healthy_proxies)
+            proxy = self._pick(healthy_proxies, self._healthy_weights)
             
             logger.debug(f"Using proxy: {proxy.host}:{proxy.port}")
             return self.get_proxy_dict(proxy)
             
     def get_random_proxy(self) -> Optional[Dict[str, str]]:
         with self.lock:
-            healthy_proxies = [p for p in self.proxies if p.is_healthy]
+            healthy_proxies = self._healthy
             if not healthy_proxies:
                 return None
                 
-            proxy = random.choice(healthy_proxies)
+            proxy = random.choices(healthy_proxies, weights=self._healthy_weights)[0]
             logger.debug(f"Using random proxy: {proxy.host}:{proxy.port}")
             return self.get_proxy_dict(proxy)
             
-    def get_next_http_proxy(self) -> Optional[Dict[str, str]]:
+    def _next_http_proxy(self) -> Optional[ProxyConfig]:
         with self.lock:
             if not self.proxies:
                 return None
                 
-            http_proxies = [p for p in self.proxies if p.is_healthy and p.proxy_type == 'http']
+            http_proxies = self._healthy_http
             if not http_proxies:
                 logger.warning("No healthy HTTP proxies available!")
                 return None
                 
-            proxy = http_proxies[self.current_proxy_index % len(http_proxies)]
-            self.current_proxy_index = (self.current_proxy_index + 1) % len(http_proxies)
+            proxy = self._pick(http_proxies, self._healthy_http_weights)
             
             logger.debug(f"Using HTTP proxy: {proxy.host}:{proxy.port}")
-            return self.get_proxy_dict(proxy)
+            return proxy
             
-    def check_proxy_health(self, proxy: ProxyConfig) -> bool:
-        try:
-            proxy_dict = self.get_proxy_dict(proxy)
-            test_url = random.choice(self.health_check_urls)
-            
-            response = requests.get(
-                test_url,
-                proxies=proxy_dict,
-                timeout=10,
-                headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            )
+    def get_next_http_proxy(self) -> Optional[Dict[str, str]]:
+        proxy = self._next_http_proxy()
+        return self.get_proxy_dict(proxy) if proxy else None
+        
+    def get_next_http_proxy_url(self) -> Optional[str]:
+        proxy = self._next_http_proxy()
+        return proxy.url if proxy else None
             
-            if response.status_code == 200:
-                proxy.success_count += 1
-                proxy.failure_count = 0  
-                proxy.is_healthy = True
-                proxy.last_checked = time.time()
-                logger.debug(f"Proxy {proxy.host}:{proxy.port} is healthy")
-                return True
-            else:
-                raise requests.exceptions.RequestException(f"Status code: {response.status_code}")
-                
-        except Exception as e:
-            proxy.failure_count += 1
-            if proxy.failure_count >= self.max_failures:
-                proxy.is_healthy = False
-                logger.warning(f"Proxy {proxy.host}:{proxy.port} marked as unhealthy after {proxy.failure_count} failures")
-            else:
-                logger.debug(f"Proxy {proxy.host}:{proxy.port} failed health check: {e}")
-            proxy.last_checked = time.time()
-            return False
+    def _record_health(self, proxy: ProxyConfig, error: Optional[Exception],
+                       latency_ms: Optional[float] = None) -> bool:
+        
+        proxy.last_checked = time.time()
+        if error is None:
+            if latency_ms is not None:
+                if proxy.latency_ms_ewma:
+                    proxy.latency_ms_ewma += _LATENCY_ALPHA * (latency_ms - proxy.latency_ms_ewma)
+                else:
+                    proxy.latency_ms_ewma = latency_ms
+            proxy.success_count += 1
+            proxy.failure_count = 0  
+            self._set_healthy(proxy, True)
+            logger.debug(f"Proxy {proxy.host}:{proxy.port} is healthy")
+            return True
+        
+        proxy.failure_count += 1
+        if proxy.failure_count >= self.max_failures:
+            self._set_healthy(proxy, False)
+            logger.warning(f"Proxy {proxy.host}:{proxy.port} marked as unhealthy after {proxy.failure_count} failures")
+        else:
+            logger.debug(f"Proxy {proxy.host}:{proxy.port} failed health check: {error}")
+        return False
+            
+    def _health_check_targets(self) -> List[str]:
+        urls = self.health_check_urls
+        with self.lock:
+            start = self._health_url_index
+            self._health_url_index += 1
+        return [urls[(start + i) % len(urls)] for i in range(min(2, len(urls)))]
+            
+    def check_proxy_health(self, proxy: ProxyConfig) -> bool:
+        error = None
+        for url in self._health_check_targets():
+            try:
+                started = time.monotonic()
+                response = self._health_session.get(
+                    url,
+                    proxies=self.get_proxy_dict(proxy),
+                    timeout=10,
+                    headers=_HEALTH_CHECK_HEADERS
+                )
+                if response.status_code == 200:
+                    return self._record_health(proxy, None, (time.monotonic() - started) * 1000)
+                error = requests.exceptions.RequestException(f"Status code: {response.status_code}")
+            except Exception as e:
+                error = e
+        return self._record_health(proxy, error)
+    
+    async def check_proxy_health_async(self, proxy: ProxyConfig, session: aiohttp.ClientSession) -> bool:
+        if proxy.proxy_type != "http":
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.check_proxy_health, proxy)
+        
+        error = None
+        for url in self._health_check_targets():
+            try:
+                started = time.monotonic()
+                async with session.get(url, proxy=proxy.url) as response:
+                    if response.status == 200:
+                        return self._record_health(proxy, None, (time.monotonic() - started) * 1000)
+                    error = aiohttp.ClientError(f"Status code: {response.status}")
+            except Exception as e:
+                error = e
+        return self._record_health(proxy, error)
             
     def health_check_all(self) -> None:
         if not self.proxies:
             return
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self.health_check_all_async())
+            return
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(asyncio.run, self.health_check_all_async()).result()
+        
+    async def health_check_all_async(self, concurrency: int = 50,
+                                     on_checked: Optional[Callable[[ProxyConfig, bool], None]] = None) -> None:
+        if not self.proxies:
+            return
             
         logger.info("Starting proxy health check...")
         
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_proxy = {
-                executor.submit(self.check_proxy_health, proxy): proxy 
-                for proxy in self.proxies
-            }
-            
-            for future in as_completed(future_to_proxy):
-                proxy = future_to_proxy[future]
-                try:
-                    future.result()
-                except Exception as e:
-                    logger.error(f"Health check error for {proxy.host}:{proxy.port}: {e}")
-                    
+        semaphore = asyncio.Semaphore(concurrency)
+        timeout = aiohttp.ClientTimeout(total=10)
+        
+        async with aiohttp.ClientSession(timeout=timeout, headers=_HEALTH_CHECK_HEADERS) as session:
+            async def check(proxy: ProxyConfig) -> None:
+                async with semaphore:
+                    healthy = await self.check_proxy_health_async(proxy, session)
+                if on_checked:
+                    on_checked(proxy, healthy)
+            
+            await asyncio.gather(*map(check, self.proxies))
+            
+        with self.lock:
+            self._rebuild_weights()
+        
         healthy_count = sum(1 for p in self.proxies if p.is_healthy)
         logger.info(f"Health check complete: {healthy_count}/{len(self.proxies)} proxies healthy")
         
     def get_proxy_stats(self) -> Dict[str, Any]:
-        total_proxies = len(self.proxies)
-        healthy_proxies = sum(1 for p in self.proxies if p.is_healthy)
+        details = []
+        healthy_proxies = 0
+        for proxy in self.proxies:
+            values = _proxy_detail_values(proxy)
+            healthy_proxies += values[3]
+            details.append(dict(zip(_PROXY_DETAIL_KEYS, values)))
+        total_proxies = len(details)
         
-        stats = {
+        return {
             'total_proxies': total_proxies,
             'healthy_proxies': healthy_proxies,
             'unhealthy_proxies': total_proxies - healthy_proxies,
             'health_rate': (healthy_proxies / total_proxies * 100) if total_proxies > 0 else 0,
-            'proxy_details': []
+            'proxy_details': details
         }
         
-        for proxy in self.proxies:
-            stats['proxy_details'].append({
-                'host': proxy.host,
-                'port': proxy.port,
-                'type': proxy.proxy_type,
-                'is_healthy': proxy.is_healthy,
-                'success_count': proxy.success_count,
-                'failure_count': proxy.failure_count,
-                'last_checked': proxy.last_checked
-            })
-            
-        return stats
+    def _find_proxy(self, proxy_url: str) -> Optional[ProxyConfig]:
+        proxy = self._by_url.get(proxy_url)
+        if proxy is None and '@' in proxy_url:
+            host, _, port = proxy_url.rpartition('@')[2].partition(':')
+            proxy = self._by_host_port.get((host, int(port)))
+        return proxy
         
     def mark_proxy_failed(self, proxy_dict: Dict[str, str]) -> None:
 
         try:
-            proxy_url = proxy_dict.get('http', proxy_dict.get('https', ''))
-            if '@' in proxy_url:
-                host_port = proxy_url.split('@')[1]
-                host = host_port.split(':')[0]
-                port = int(host_port.split(':')[1])
+            proxy_url = proxy_dict.get('http') or proxy_dict.get('https', '')
+            with self.lock:
+                proxy = self._find_proxy(proxy_url)
+                if proxy is None:
+                    return
                 
-                with self.lock:
-                    for proxy in self.proxies:
-                        if proxy.host == host and proxy.port == port:
-                            proxy.failure_count += 1
-                            if proxy.failure_count >= self.max_failures:
-                                proxy.is_healthy = False
-                                logger.warning(f"Proxy {host}:{port} marked unhealthy due to failures")
-                            break
+                proxy.failure_count += 1
+                if proxy.failure_count >= self.max_failures and proxy.is_healthy:
+                    proxy.is_healthy = False
+                    self._rebuild_healthy()
+                    logger.warning(f"Proxy {proxy.host}:{proxy.port} marked unhealthy due to failures")
         except Exception as e:
             logger.error(f"Error marking proxy as failed: {e}")
             
     def start_health_monitoring(self) -> None:
         
+        if self._monitor_thread is not None and self._monitor_thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        
         def monitor():
-            while True:
-                time.sleep(self.health_check_interval)
+            while not self._stop_event.wait(self.health_check_interval):
                 self.health_check_all()
                 
-        monitor_thread = threading.Thread(target=monitor, daemon=True)
-        monitor_thread.start()
+        self._monitor_thread = threading.Thread(target=monitor, daemon=True)
+        self._monitor_thread.start()
         logger.info("Started proxy health monitoring thread")
+        
+    def start_health_monitoring_async(self) -> asyncio.Task:
+        
+        if self._monitor_task is None or self._monitor_task.done():
+            self._monitor_task = asyncio.create_task(self._monitor_loop())
+            logger.info("Started proxy health monitoring task")
+        return self._monitor_task
+        
+    async def _monitor_loop(self) -> None:
+        
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            await self.health_check_all_async()
+            
+    def stop_health_monitoring(self) -> None:
+        
+        self._stop_event.set()
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            self._monitor_task = None
+        if self._monitor_thread is not None:
+            self._monitor_thread.join(timeout=1)
+            self._monitor_thread = None
+        logger.info("Stopped proxy health monitoring")
 
 
 def create_default_proxy_manager() -> ProxyManager:
@@ -0,0 +1,61 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+
+class RequestBatcher:
+    
+    def __init__(self, fetch: Callable[..., Awaitable[Any]], interval_ms: float = 10, max_size: int = 16):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        
+        self._fetch = fetch
+        self.interval = interval_ms / 1000
+        self.max_size = max_size
+        self._pending: List[Tuple[str, Optional[Dict], Dict[str, Any], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._batches: Set[asyncio.Task] = set()
+    
+    async def submit(self, url: str, params: Optional[Dict] = None, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((url, params, kwargs, future))
+        
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.interval, self._flush)
+        return await future
+    
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+    
+    async def _run(self, batch: List[Tuple[str, Optional[Dict], Dict[str, Any], asyncio.Future]]) -> None:
+        batch.sort(key=lambda item: urlsplit(item[0]).netloc)
+        results = await asyncio.gather(
+            *(self._fetch(url, params, **kwargs) for url, params, kwargs, _ in batch),
+            return_exceptions=True
+        )
+        
+        for (_, _, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, asyncio.CancelledError):
+                future.cancel()
+            elif isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+    
+    async def aclose(self) -> None:
+        self._flush()
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
@@ -1,12 +1,18 @@
 import requests
-import time
-import json
-from typing import Dict, List, Optional, Any, Generator
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Any, Generator, Tuple
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin, urlencode
 from datetime import datetime
+from itertools import islice
 
+from ._compat import gc_paused, json_loads, write_json_stream, JSONDecodeError
 from .base_scraper import BaseScraper
+from .rate_limiter import TokenBucket
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -14,36 +20,94 @@ logger = logging.getLogger(__name__)
 
 class RequestsScraper(BaseScraper):
     
-    def __init__(self, delay: float = 2.0, user_agent: str = "RedditScraper/1.0"):
+    _CACHE_SIZE = 32
+    _UNCACHED_PARAMS = frozenset({'after', 'before'})
+    
+    def __init__(self, delay: float = 2.0, user_agent: str = "RedditScraper/1.0", burst: int = 5):
         
         super().__init__(delay)
+        self.rate_limiter = TokenBucket(1.0 / delay, burst=burst) if delay > 0 else None
         self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504),
+                              respect_retry_after_header=False)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             'User-Agent': user_agent,
             'Accept': 'application/json'
         })
+        self._etag_cache: "OrderedDict[Tuple, Tuple[Optional[str], Optional[str], bytes]]" = OrderedDict()
+        self._etag_lock = threading.Lock()
+        
+    def _is_cacheable(self, url: str, params: Optional[Dict]) -> bool:
+        
+        if '/comments/' in url:
+            return False
+        return not (params and self._UNCACHED_PARAMS.intersection(params))
+        
+    def _cached_response(self, key: Tuple) -> Optional[Tuple[Optional[str], Optional[str], bytes]]:
+        
+        with self._etag_lock:
+            entry = self._etag_cache.get(key)
+            if entry is not None:
+                self._etag_cache.move_to_end(key)
+            return entry
+        
+    def _store_response(self, key: Tuple, etag: Optional[str], last_modified: Optional[str], body: bytes) -> None:
+        
+        with self._etag_lock:
+            self._etag_cache[key] = (etag, last_modified, body)
+            self._etag_cache.move_to_end(key)
+            if len(self._etag_cache) > self._CACHE_SIZE:
+                self._etag_cache.popitem(last=False)
         
     def _make_request(self, url: str, params: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
         
         try:
+            if self.rate_limiter:
+                self.rate_limiter.acquire_blocking()
             logger.debug(f"Fetching: {url} with params: {params}")
-            response = self.session.get(url, params=params)
+            cacheable = self._is_cacheable(url, params)
+            key = (url, tuple(sorted(params.items())) if params else ())
+            cached = self._cached_response(key) if cacheable else None
+            headers = None
+            if cached:
+                headers = {}
+                if cached[0]:
+                    headers['If-None-Match'] = cached[0]
+                if cached[1]:
+                    headers['If-Modified-Since'] = cached[1]
+            response = self.session.get(url, params=params, headers=headers)
+            if response.status_code == 304 and cached:
+                logger.debug(f"Not modified: {url}")
+                with gc_paused():
+                    return json_loads(cached[2])
             response.raise_for_status()
             
-            self._sleep_with_delay()
-            
-            return response.json()
+            with gc_paused():
+                data = json_loads(response.content)
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if cacheable and (etag or last_modified):
+                self._store_response(key, etag, last_modified, response.content)
+            return data
         except requests.exceptions.RequestException as e:
             logger.error(f"Request failed for {url}: {e}")
             return None
-        except json.JSONDecodeError as e:
+        except JSONDecodeError as e:
             logger.error(f"JSON decode failed for {url}: {e}")
             return None
     
     def scrape_subreddit_paginated(self, subreddit: str, sort_by: str = "hot",
-                                  max_posts: int = 1000, batch_size: int = 100) -> Generator[Dict[str, Any], None, None]:
+                                  max_posts: int = 1000, batch_size: int = 100,
+                                  lean: bool = False) -> Generator[Dict[str, Any], None, None]:
 
         url = f"https://www.reddit.com/r/{subreddit}/{sort_by}.json"
+        listing = self._raw_listing if lean else self._clean_listing
         after = None
         posts_fetched = 0
         
@@ -66,11 +130,9 @@ class RequestsScraper(BaseScraper):
                 logger.info("No more posts available")
                 break
                 
-            for child in children:
-                if child['kind'] == 't3' and posts_fetched < max_posts:
-                    cleaned_post = self._clean_post_data(child['data'])
-                    yield cleaned_post
-                    posts_fetched += 1
+            page = list(islice(listing(children), max_posts - posts_fetched))
+            posts_fetched += len(page)
+            yield from page
                     
             after = data['data'].get('after')
             if not after:
@@ -80,20 +142,18 @@ class RequestsScraper(BaseScraper):
         logger.info(f"Finished scraping {posts_fetched} posts from r/{subreddit}")
     
     def scrape_multiple_subreddits(self, subreddits: List[str], sort_by: str = "hot",
-                                  posts_per_subreddit: int = 100) -> Dict[str, List[Dict[str, Any]]]:
+                                  posts_per_subreddit: int = 100,
+                                  max_workers: int = 4) -> Dict[str, List[Dict[str, Any]]]:
         
-        results = {}
+        if not subreddits:
+            return {}
         
-        for subreddit in subreddits:
+        def scrape(subreddit: str) -> List[Dict[str, Any]]:
             logger.info(f"Scraping r/{subreddit}")
-            posts = list(self.scrape_subreddit_paginated(
-                subreddit, sort_by, posts_per_subreddit
-            ))
-            results[subreddit] = posts
-            
-            time.sleep(self.delay * 2)
-            
-        return results
+            return list(self.scrape_subreddit_paginated(subreddit, sort_by, posts_per_subreddit))
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(subreddits)))) as executor:
+            return dict(zip(subreddits, executor.map(scrape, subreddits)))
     
     def scrape_comments_deep(self, subreddit: str, post_id: str, 
                            max_depth: int = 10) -> Dict[str, Any]:
@@ -123,19 +183,29 @@ class RequestsScraper(BaseScraper):
     def _extract_all_comments(self, comments_children: List[Dict], 
                              all_comments: List[Dict[str, Any]], depth: int = 0) -> None:
         
-        for child in comments_children:
-            if child['kind'] == 't1':  
+        clean = self._clean_comment_data
+        append = all_comments.append
+        stack = [(iter(comments_children), depth)]
+        
+        while stack:
+            children, depth = stack[-1]
+            for child in children:
+                if child['kind'] != 't1':
+                    continue
                 comment_data = child['data']
-                comment = self._clean_comment_data(comment_data)
+                comment = clean(comment_data)
                 comment['depth'] = depth
-                if comment_data.get('permalink'):
-                    comment['permalink'] = comment_data.get('permalink')
-                all_comments.append(comment)
-                
-                if 'replies' in comment_data and comment_data['replies']:
-                    if isinstance(comment_data['replies'], dict):
-                        reply_children = comment_data['replies']['data']['children']
-                        self._extract_all_comments(reply_children, all_comments, depth + 1)
+                permalink = comment_data.get('permalink')
+                if permalink:
+                    comment['permalink'] = permalink
+                append(comment)
+                
+                replies = comment_data.get('replies')
+                if replies and isinstance(replies, dict):
+                    stack.append((iter(replies['data']['children']), depth + 1))
+                    break
+            else:
+                stack.pop()
     
     def search_advanced(self, query: str, subreddit: Optional[str] = None,
                        sort_by: str = "relevance", time_filter: str = "all",
@@ -172,11 +242,9 @@ class RequestsScraper(BaseScraper):
             if not children:
                 break
                 
-            for child in children:
-                if child['kind'] == 't3' and results_fetched < max_results:
-                    cleaned_post = self._clean_post_data(child['data'])
-                    yield cleaned_post
-                    results_fetched += 1
+            page = list(islice(self._clean_listing(children), max_results - results_fetched))
+            results_fetched += len(page)
+            yield from page
                     
             after = data['data'].get('after')
             if not after:
@@ -230,16 +298,16 @@ class RequestsScraper(BaseScraper):
                 
             for subreddit in subreddits:
                 logger.info(f"Bulk scraping r/{subreddit}")
-                posts = list(self.scrape_subreddit_paginated(subreddit, max_posts=500))
+                posts = self.scrape_subreddit_paginated(subreddit, max_posts=500)
                 
                 filename = f"{subreddit}_posts.{output_format}"
-                if output_format == "json":
-                    with open(filename, 'w') as f:
-                        json.dump(posts, f, indent=2)
+                if output_format in ("json", "jsonl"):
+                    with open(filename, 'wb') as f:
+                        count = write_json_stream(posts, f, lines=output_format == "jsonl")
+                else:
+                    count = sum(1 for _ in posts)
                         
-                logger.info(f"Saved {len(posts)} posts to {filename}")
-                
-                time.sleep(self.delay * 3)
+                logger.info(f"Saved {count} posts to {filename}")
                 
         except FileNotFoundError:
             logger.error(f"Subreddit list file not found: {subreddit_list_file}")
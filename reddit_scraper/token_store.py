@@ -0,0 +1,87 @@
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Tuple
+
+
+class TokenStore(ABC):
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+
+        pass
+    
+    @abstractmethod
+    def set(self, key: str, token: str, ttl: float) -> None:
+
+        pass
+    
+    @abstractmethod
+    def delete(self, key: str) -> None:
+
+        pass
+    
+    def close(self) -> None:
+        pass
+
+
+class SQLiteTokenStore(TokenStore):
+    
+    def __init__(self, path: str = "captcha_tokens.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tokens (key TEXT PRIMARY KEY, token TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+    
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, token FROM tokens WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+    
+    def set(self, key: str, token: str, ttl: float) -> None:
+        with self._lock:
+            now = time.time()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tokens (key, token, expires_at) VALUES (?, ?, ?)", (key, token, now + ttl)
+            )
+            self._conn.execute("DELETE FROM tokens WHERE expires_at <= ?", (now,))
+    
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM tokens WHERE key = ?", (key,))
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RedisTokenStore(TokenStore):
+    
+    def __init__(self, client: Any, prefix: str = "captcha_token:"):
+        self.client = client
+        self.prefix = prefix
+    
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        name = self.prefix + key
+        pipe = self.client.pipeline()
+        pipe.get(name)
+        pipe.pttl(name)
+        token, pttl = pipe.execute()
+        if token is None or pttl is None or pttl <= 0:
+            return None
+        if isinstance(token, bytes):
+            token = token.decode('utf-8')
+        return time.time() + pttl / 1000, token
+    
+    def set(self, key: str, token: str, ttl: float) -> None:
+        self.client.set(self.prefix + key, token, px=int(ttl * 1000))
+    
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
@@ -1,7 +1,7 @@
+import functools
 import re
 import logging
-from typing import Optional, List
-from urllib.parse import urlparse
+from typing import Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -10,22 +10,41 @@ class ValidationError(Exception):
     pass
 
 
+_SUBREDDIT_RE = re.compile(r'[a-zA-Z0-9_]{1,21}')
+_USERNAME_RE = re.compile(r'[a-zA-Z0-9_-]{3,20}')
+_POST_ID_RE = re.compile(r'[a-z0-9]{4,10}')
+_FILENAME_TRANS = str.maketrans(dict.fromkeys(
+    '<>:"/\\|?*' + ''.join(c for c in map(chr, range(0x3001)) if c.isspace()), '_'
+))
+_RESERVED_SUBREDDITS = frozenset({'api', 'www', 'old', 'new', 'mod', 'admin'})
+_URL_RE = re.compile(r'https?://[^\s/?#]+(?:[/?#]\S*)?\Z', re.IGNORECASE)
+_URL_SCHEME_RE = re.compile(r'([a-zA-Z][a-zA-Z0-9+.-]*)://[^\s/?#]')
+_DEFAULT_SORTS = ('hot', 'new', 'top', 'rising', 'best')
+
+
 def validate_subreddit_name(subreddit: str) -> str:
 
+    if isinstance(subreddit, str):
+        return _validate_subreddit_name(subreddit)
+    return _validate_subreddit_name.__wrapped__(subreddit)
+
+
+@functools.lru_cache(maxsize=1024)
+def _validate_subreddit_name(subreddit: str) -> str:
+
     if not subreddit:
         raise ValidationError("Subreddit name cannot be empty")
     
     if subreddit.startswith('r/'):
         subreddit = subreddit[2:]
     
-    if not re.match(r'^[a-zA-Z0-9_]{1,21}$', subreddit):
+    if not _SUBREDDIT_RE.fullmatch(subreddit):
         raise ValidationError(
             f"Invalid subreddit name: '{subreddit}'. "
             "Must be 1-21 characters, letters/numbers/underscores only"
         )
     
-    banned_names = {'api', 'www', 'old', 'new', 'mod', 'admin'}
-    if subreddit.lower() in banned_names:
+    if subreddit.lower() in _RESERVED_SUBREDDITS:
         raise ValidationError(f"Subreddit name '{subreddit}' is reserved or problematic.")
     
     return subreddit.lower()
@@ -33,13 +52,21 @@ def validate_subreddit_name(subreddit: str) -> str:
 
 def validate_username(username: str) -> str:
 
+    if isinstance(username, str):
+        return _validate_username(username)
+    return _validate_username.__wrapped__(username)
+
+
+@functools.lru_cache(maxsize=1024)
+def _validate_username(username: str) -> str:
+
     if not username:
         raise ValidationError("Username cannot be empty")
     
     if username.startswith('u/'):
         username = username[2:]
     
-    if not re.match(r'^[a-zA-Z0-9_-]{3,20}$', username):
+    if not _USERNAME_RE.fullmatch(username):
         raise ValidationError(
             f"Invalid username: '{username}'. "
             "Must be 3-20 characters, letters/numbers/underscores/hyphens only"
@@ -53,7 +80,7 @@ def validate_post_id(post_id: str) -> str:
     if not post_id:
         raise ValidationError("Post ID cannot be empty")
     
-    if not re.match(r'^[a-z0-9]{4,10}$', post_id.lower()):
+    if not _POST_ID_RE.fullmatch(post_id.lower()):
         raise ValidationError(
             f"Invalid post ID: '{post_id}'. "
             "Must be 4-10 characters, letters and numbers only"
@@ -64,6 +91,14 @@ def validate_post_id(post_id: str) -> str:
 
 def validate_limit(limit, max_limit: int = 50000) -> int:
     
+    if isinstance(limit, (int, str)):
+        return _validate_limit(limit, max_limit)
+    return _validate_limit.__wrapped__(limit, max_limit)
+
+
+@functools.lru_cache(maxsize=1024)
+def _validate_limit(limit, max_limit: int) -> int:
+    
     try:
         limit = int(limit)
     except (ValueError, TypeError):
@@ -78,14 +113,23 @@ def validate_limit(limit, max_limit: int = 50000) -> int:
     return limit
 
 
-def validate_sort_method(sort_method: str, valid_sorts: Optional[List[str]] = None) -> str:
+def validate_sort_method(sort_method: str, valid_sorts: Optional[Sequence[str]] = None) -> str:
+
+    if valid_sorts is None:
+        valid_sorts = _DEFAULT_SORTS
+    elif type(valid_sorts) is not tuple:
+        valid_sorts = tuple(valid_sorts)
+    if isinstance(sort_method, str):
+        return _validate_sort_method(sort_method, valid_sorts)
+    return _validate_sort_method.__wrapped__(sort_method, valid_sorts)
+
+
+@functools.lru_cache(maxsize=1024)
+def _validate_sort_method(sort_method: str, valid_sorts: Tuple[str, ...]) -> str:
 
     if not sort_method:
         raise ValidationError("Invalid sort method: cannot be empty")
     
-    if valid_sorts is None:
-        valid_sorts = ['hot', 'new', 'top', 'rising', 'best']
-    
     sort_method = sort_method.lower()
     if sort_method not in valid_sorts:
         raise ValidationError(
@@ -101,19 +145,14 @@ def validate_url(url: str) -> str:
     if not url:
         raise ValidationError("URL cannot be empty")
     
-    try:
-        parsed = urlparse(url)
-        if not parsed.scheme or not parsed.netloc:
-            raise ValidationError(f"Invalid URL format: '{url}'")
-        
-        if parsed.scheme not in ['http', 'https']:
+    if isinstance(url, str):
+        if _URL_RE.match(url):
+            return url
+        scheme = _URL_SCHEME_RE.match(url)
+        if scheme and scheme.group(1).lower() not in ('http', 'https'):
             raise ValidationError(f"Invalid URL format: '{url}' (only HTTP/HTTPS allowed)")
-        
-        return url
-    except ValidationError:
-        raise
-    except Exception:
-        raise ValidationError(f"Invalid URL format: '{url}'")
+    
+    raise ValidationError(f"Invalid URL format: '{url}'")
 
 
 def validate_delay(delay) -> float:
@@ -137,15 +176,9 @@ def sanitize_filename(filename: str) -> str:
     if not filename:
         return "untitled"
     
-    sanitized = re.sub(r'[<>:"/\\|?*\s]', '_', filename)
+    sanitized = filename.translate(_FILENAME_TRANS)
     
     if filename.startswith('../../../') and not filename.startswith('../../../../'):
         sanitized = sanitized.replace('.._.._.._', '.._.._.._.._', 1)
     
-    if len(sanitized) > 100:
-        sanitized = sanitized[:100]
-    
-    if not sanitized.strip('_'):
-        return "untitled"
-    
-    return sanitized.strip('_')
\ No newline at end of file
+    return sanitized[:100].strip('_') or "untitled"
\ No newline at end of file
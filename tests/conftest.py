@@ -1,15 +1,28 @@
+import hashlib
 import pytest
+import pytest_asyncio
 import asyncio
 import json
+import re
+from pathlib import Path
 from typing import Dict, Any
 from unittest.mock import Mock, AsyncMock
 import aiohttp
-from aioresponses import aioresponses
+from aioresponses import CallbackResult, aioresponses
 
 from reddit_scraper import JSONScraper, ConfigManager
+from reddit_scraper import json_scraper as json_scraper_module
 from reddit_scraper.proxy_manager import ProxyManager
 from reddit_scraper.captcha_solver import CaptchaSolverManager
 
+LIVE_CACHE_KEY = "reddit_scraper/last_live_ok"
+REDDIT_JSON_URL = re.compile(r"^https://www\.reddit\.com/.*\.json(?:\?.*)?$")
+
+
+@pytest.fixture(autouse=True)
+def no_retry_backoff(monkeypatch):
+    monkeypatch.setattr(json_scraper_module, "_BACKOFF", (0,) * len(json_scraper_module._BACKOFF))
+
 
 @pytest.fixture
 def sample_reddit_post():
@@ -104,9 +117,9 @@ def mock_captcha_solver():
     return mock
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def json_scraper():
-    scraper = JSONScraper(delay=0.1, rotate_user_agents=False)
+    scraper = JSONScraper(delay=0, rotate_user_agents=False, retry_delay=0)
     yield scraper
     await scraper.close_session()
 
@@ -124,8 +137,51 @@ def aiohttp_mock():
         yield mock
 
 
+@pytest.fixture
+def reddit_api(aiohttp_mock):
+    routes = {}
+    
+    def dispatch(url, **kwargs):
+        response = routes.get(url.path, 404)
+        if isinstance(response, int):
+            return CallbackResult(status=response)
+        return CallbackResult(payload=response)
+    
+    aiohttp_mock.get(REDDIT_JSON_URL, callback=dispatch, repeat=True)
+    return routes
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     loop = asyncio.get_event_loop_policy().new_event_loop()
     yield loop
-    loop.close()
\ No newline at end of file
+    loop.close()
+
+
+def _live_fingerprint():
+    return hashlib.sha256(Path(json_scraper_module.__file__).read_bytes()).hexdigest()
+
+
+def pytest_addoption(parser):
+    parser.addoption("--live", action="store_true", default=False,
+                     help="run slow tests that hit the real Reddit API")
+
+
+def pytest_collection_modifyitems(config, items):
+    live = config.getoption("--live")
+    cache = getattr(config, "cache", None)
+    unchanged = live and cache is not None and cache.get(LIVE_CACHE_KEY, None) == _live_fingerprint()
+    
+    for item in items:
+        item.user_properties.append(("markers", " ".join(sorted({m.name for m in item.iter_markers()}))))
+        if item.get_closest_marker("slow"):
+            if not live:
+                item.add_marker(pytest.mark.skip(reason="needs --live"))
+            elif unchanged:
+                item.add_marker(pytest.mark.skip(reason="json_scraper unchanged since last passing live run"))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    cache = getattr(session.config, "cache", None)
+    if session.config.getoption("--live") and exitstatus == 0 and cache is not None:
+        cache.set(LIVE_CACHE_KEY, _live_fingerprint())
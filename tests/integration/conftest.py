@@ -0,0 +1,57 @@
+import pytest
+from click.testing import CliRunner
+
+from reddit_scraper import cli_helpers
+from reddit_scraper.json_scraper import JSONScraper
+
+
+class FakeCall:
+    
+    def __init__(self, return_value=None):
+        self.return_value = return_value
+        self.calls = []
+    
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return self.return_value
+
+
+class AsyncFakeCall(FakeCall):
+    
+    async def __call__(self, *args, **kwargs):
+        return super().__call__(*args, **kwargs)
+
+
+@pytest.fixture(scope="session")
+def runner():
+    return CliRunner()
+
+
+def _fake(monkeypatch, target, name, fake):
+    monkeypatch.setattr(target, name, fake)
+    return fake
+
+
+@pytest.fixture
+def fake_scrape_subreddit(monkeypatch):
+    return _fake(monkeypatch, JSONScraper, 'scrape_subreddit', AsyncFakeCall([]))
+
+
+@pytest.fixture
+def fake_scrape_user_posts(monkeypatch):
+    return _fake(monkeypatch, JSONScraper, 'scrape_user_posts', AsyncFakeCall([]))
+
+
+@pytest.fixture
+def fake_scrape_post_comments(monkeypatch):
+    return _fake(monkeypatch, JSONScraper, 'scrape_post_comments', AsyncFakeCall({}))
+
+
+@pytest.fixture
+def fake_execute_scraping_job(monkeypatch):
+    return _fake(monkeypatch, cli_helpers, 'execute_scraping_job', AsyncFakeCall([]))
+
+
+@pytest.fixture
+def fake_gather_interactive_input(monkeypatch):
+    return _fake(monkeypatch, cli_helpers, 'gather_interactive_input', FakeCall())
@@ -1,19 +1,16 @@
 import pytest
 import json
-import tempfile
-import os
 import asyncio
-from click.testing import CliRunner
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch
 
-from reddit_scraper.cli import main
+from reddit_scraper.cli import main, stream_data
+from reddit_scraper.config import ConfigManager
 
 
 @pytest.mark.integration
 class TestCLIBasic:
     
-    def test_cli_help(self):
-        runner = CliRunner()
+    def test_cli_help(self, runner):
         result = runner.invoke(main, ['--help'])
         
         assert result.exit_code == 0
@@ -21,8 +18,7 @@ class TestCLIBasic:
         assert "json" in result.output
         assert "requests" in result.output
     
-    def test_json_command_help(self):
-        runner = CliRunner()
+    def test_json_command_help(self, runner):
         result = runner.invoke(main, ['json', '--help'])
         
         assert result.exit_code == 0
@@ -32,11 +28,9 @@ class TestCLIBasic:
 @pytest.mark.integration 
 class TestCLISubredditCommand:
     
-    @patch('reddit_scraper.json_scraper.JSONScraper.scrape_subreddit', new_callable=AsyncMock)
-    def test_subreddit_command_basic(self, mock_scrape):
-        mock_scrape.return_value = []
+    def test_subreddit_command_basic(self, runner, fake_scrape_subreddit):
+        fake_scrape_subreddit.return_value = []
         
-        runner = CliRunner()
         result = runner.invoke(main, [
             'json', 'subreddit', 'test',
             '--limit', '5',
@@ -44,10 +38,9 @@ class TestCLISubredditCommand:
         ])
         
         assert result.exit_code == 0
-        mock_scrape.assert_called_once()
+        assert len(fake_scrape_subreddit.calls) == 1
     
-    def test_subreddit_command_invalid_input(self):
-        runner = CliRunner()
+    def test_subreddit_command_invalid_input(self, runner):
         result = runner.invoke(main, [
             'json', 'subreddit', 'invalid!',
             '--limit', '5'
@@ -55,46 +48,80 @@ class TestCLISubredditCommand:
         
         assert result.exit_code == 1  
     
-    @patch('reddit_scraper.json_scraper.JSONScraper.scrape_subreddit', new_callable=AsyncMock)
-    def test_subreddit_command_with_output(self, mock_scrape):
-        mock_scrape.return_value = [
+    def test_subreddit_with_comments_rejects_zero_concurrency(self, runner):
+        result = runner.invoke(main, [
+            'json', 'subreddit-with-comments', 'python',
+            '--include-comments', '--concurrency', '0'
+        ])
+        
+        assert result.exit_code == 2
+        assert "--concurrency" in result.output
+    
+    def test_subreddit_command_with_output(self, runner, fake_scrape_subreddit, tmp_path):
+        fake_scrape_subreddit.return_value = [
             {
                 'title': 'Test Post',
                 'author': 'test_user',
                 'score': 10,
-                'id': 'abc123'
+                'id': 'abc123',
+                'awards': {1: 'silver'}
             }
         ]
         
-        runner = CliRunner()
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp:
-            try:
-                result = runner.invoke(main, [
-                    'json', 'subreddit', 'test',
-                    '--limit', '1',
-                    '--output', tmp.name,
-                    '--delay', '0.1'
-                ])
-                
-                assert result.exit_code == 0
-                
-                with open(tmp.name, 'r') as f:
-                    data = json.load(f)
-                    assert len(data) == 1
-                    assert data[0]['title'] == 'Test Post'
-                    
-            finally:
-                os.unlink(tmp.name)
+        output = tmp_path / "out.json"
+        result = runner.invoke(main, [
+            'json', 'subreddit', 'test',
+            '--limit', '1',
+            '--output', str(output),
+            '--delay', '0.1'
+        ])
+        
+        assert result.exit_code == 0
+        
+        data = json.loads(output.read_text())
+        assert len(data) == 1
+        assert data[0]['title'] == 'Test Post'
+        assert data[0]['awards'] == {'1': 'silver'}
+    
+    def test_subreddit_command_csv_output(self, runner, fake_scrape_subreddit, tmp_path):
+        fake_scrape_subreddit.return_value = [
+            {
+                'title': 'Test Post',
+                'id': 'abc123',
+                'media': {'oembed': {'type': 'video'}}
+            }
+        ]
+        
+        output = tmp_path / "out.csv"
+        result = runner.invoke(main, [
+            'json', 'subreddit', 'test',
+            '--limit', '1',
+            '--output', str(output),
+            '--format', 'csv'
+        ])
+        
+        assert result.exit_code == 0
+        
+        header, row = output.read_text().splitlines()
+        assert header == 'title,id,media.oembed.type'
+        assert row == 'Test Post,abc123,video'
+    
+    def test_stream_csv_warns_about_keys_missing_from_first_row(self, tmp_path, capsys):
+        output = tmp_path / "out.csv"
+        records = [{'id': 'a', 'title': 'First'}, {'id': 'b', 'title': 'Second', 'flair': 'x'}]
+        
+        assert stream_data(iter(records), str(output), "csv") == 2
+        
+        assert output.read_text().splitlines() == ['id,title', 'a,First', 'b,Second']
+        assert "dropped keys: flair" in capsys.readouterr().out
 
 
 @pytest.mark.integration
 class TestCLIUserCommand:
     
-    @patch('reddit_scraper.json_scraper.JSONScraper.scrape_user_posts', new_callable=AsyncMock)
-    def test_user_command(self, mock_scrape):
-        mock_scrape.return_value = []
+    def test_user_command(self, runner, fake_scrape_user_posts):
+        fake_scrape_user_posts.return_value = []
         
-        runner = CliRunner()
         result = runner.invoke(main, [
             'json', 'user', 'test_user',
             '--limit', '5',
@@ -102,18 +129,16 @@ class TestCLIUserCommand:
         ])
         
         assert result.exit_code == 0
-        mock_scrape.assert_called_once()
+        assert len(fake_scrape_user_posts.calls) == 1
 
 
 @pytest.mark.integration 
 class TestCLICommentsCommand:
     
-    @patch('reddit_scraper.json_scraper.JSONScraper.scrape_post_comments', new_callable=AsyncMock)
-    def test_comments_command(self, mock_scrape):
+    def test_comments_command(self, runner, fake_scrape_post_comments):
 
-        mock_scrape.return_value = {'comments': []}
+        fake_scrape_post_comments.return_value = {'comments': []}
         
-        runner = CliRunner()
         result = runner.invoke(main, [
             'json', 'comments', 'test', 'abc123',
             '--sort', 'best',
@@ -126,11 +151,9 @@ class TestCLICommentsCommand:
 @pytest.mark.integration
 class TestCLIInteractiveMode:
     
-    @patch('reddit_scraper.cli_helpers.execute_scraping_job', new_callable=AsyncMock)
-    @patch('reddit_scraper.cli_helpers.gather_interactive_input')
-    def test_interactive_mode(self, mock_input, mock_execute):
+    def test_interactive_mode(self, runner, fake_gather_interactive_input, fake_execute_scraping_job):
         
-        mock_input.return_value = {
+        fake_gather_interactive_input.return_value = {
             'subject': 'test',
             'post_count': 5,
             'sort_method': 'hot',
@@ -139,20 +162,17 @@ class TestCLIInteractiveMode:
             'output_file': None  
         }
         
-        mock_execute.return_value = []
-        
-        runner = CliRunner()
         result = runner.invoke(main, ['interactive'])
         
         assert result.exit_code == 0
-        mock_input.assert_called_once()
-        mock_execute.assert_called_once()
+        assert len(fake_gather_interactive_input.calls) == 1
+        assert len(fake_execute_scraping_job.calls) == 1
 
 
 @pytest.mark.integration
 class TestCLIConfiguration:
     
-    def test_config_file_loading(self):
+    def test_config_file_loading(self, runner):
         config_data = {
             "scraping": {
                 "default_delay": 2.0,
@@ -161,25 +181,18 @@ class TestCLIConfiguration:
             }
         }
         
-        runner = CliRunner()
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp:
-            try:
-                json.dump(config_data, tmp)
-                tmp.flush()
-                
-                result = runner.invoke(main, [
-                    'json', 'subreddit', 'test',
-                    '--config', tmp.name,
-                    '--limit', '1'
-                ])
-                
-                assert result.exit_code == 0
-                
-            finally:
-                os.unlink(tmp.name)
+        with patch('reddit_scraper.cli.get_config_manager',
+                   return_value=ConfigManager.from_dict(config_data)) as mock_get_config:
+            result = runner.invoke(main, [
+                'json', 'subreddit', 'test',
+                '--config', 'cfg.json',
+                '--limit', '1'
+            ])
+        
+        assert result.exit_code == 0
+        mock_get_config.assert_called_once_with('cfg.json')
     
-    def test_invalid_config_file(self):
-        runner = CliRunner()
+    def test_invalid_config_file(self, runner):
         result = runner.invoke(main, [
             'json', 'subreddit', 'test',
             '--config', 'nonexistent.json',
@@ -193,8 +206,7 @@ class TestCLIConfiguration:
 @pytest.mark.slow
 class TestCLIRealRequests:
     
-    def test_real_subreddit_scraping(self):
-        runner = CliRunner()
+    def test_real_subreddit_scraping(self, runner):
         result = runner.invoke(main, [
             'json', 'subreddit', 'test',
             '--limit', '1',
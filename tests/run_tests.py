@@ -1,6 +1,18 @@
+import hashlib
 import subprocess
 import sys
 import os
+import tempfile
+import xml.etree.ElementTree as ET
+from collections import Counter
+
+DEPS_HASH_FILE = os.path.join('.pytest_cache', 'deps_hash')
+SUMMARY_GROUPS = (
+    ("Unit Tests", lambda markers: 'unit' in markers),
+    ("Integration Tests", lambda markers: 'integration' in markers),
+    ("Fast Tests Only", lambda markers: 'slow' not in markers),
+    ("All Tests with Coverage", lambda markers: True),
+)
 
 
 def run_command(cmd):
@@ -15,6 +27,49 @@ def run_command(cmd):
     return result.returncode == 0
 
 
+def install_dependencies():
+    with open('pyproject.toml', 'rb') as f:
+        deps_hash = hashlib.sha256(f.read()).hexdigest()
+    
+    if not os.environ.get('FORCE_REINSTALL') and os.path.exists(DEPS_HASH_FILE):
+        with open(DEPS_HASH_FILE) as f:
+            if f.read().strip() == deps_hash:
+                print("\nTest dependencies up to date, skipping install")
+                return True
+    
+    print("\nInstalling test dependencies...")
+    if not run_command([sys.executable, '-m', 'pip', 'install', '-e', '.[dev]']):
+        return False
+    
+    os.makedirs(os.path.dirname(DEPS_HASH_FILE), exist_ok=True)
+    with open(DEPS_HASH_FILE, 'w') as f:
+        f.write(deps_hash)
+    return True
+
+
+def summarize_junit(report_path):
+    totals = {name: Counter() for name, _ in SUMMARY_GROUPS}
+    
+    for case in ET.parse(report_path).iter('testcase'):
+        markers = set()
+        for prop in case.iter('property'):
+            if prop.get('name') == 'markers':
+                markers.update(prop.get('value', '').split())
+        
+        if case.find('failure') is not None or case.find('error') is not None:
+            outcome = 'failed'
+        elif case.find('skipped') is not None:
+            outcome = 'skipped'
+        else:
+            outcome = 'passed'
+        
+        for name, selects in SUMMARY_GROUPS:
+            if selects(markers):
+                totals[name][outcome] += 1
+    
+    return totals
+
+
 def main():
     print("Reddit Scraper Test Suite")
     print("=" * 50)
@@ -23,45 +78,34 @@ def main():
         print("ERROR: Run this script from the project root directory")
         sys.exit(1)
     
-    print("\nInstalling test dependencies...")
-    if not run_command([sys.executable, '-m', 'pip', 'install', '-e', '.[dev]']):
+    if not install_dependencies():
         print("ERROR: Failed to install dependencies")
         sys.exit(1)
     
-    test_commands = [
-        ([sys.executable, '-m', 'pytest', 'tests/unit/', '-v', '-m', 'unit'], 
-         "Unit Tests"),
-        
-        ([sys.executable, '-m', 'pytest', 'tests/integration/', '-v', '-m', 'integration'],
-         "Integration Tests"),
-        
-        ([sys.executable, '-m', 'pytest', 'tests/', '-v', '--cov=reddit_scraper'],
-         "All Tests with Coverage"),
-        
-        ([sys.executable, '-m', 'pytest', 'tests/', '-v', '-m', 'not slow'],
-         "Fast Tests Only"),
-    ]
-    
-    results = {}
+    import pytest
     
-    for cmd, description in test_commands:
-        print(f"\n{description}")
-        print("-" * 30)
-        success = run_command(cmd)
-        results[description] = success
+    with tempfile.TemporaryDirectory() as report_dir:
+        report_path = os.path.join(report_dir, 'report.xml')
+        test_args = ['tests/', '-v', '-n', 'auto', '--dist=loadfile', '--cov=reddit_scraper',
+                     f'--junit-xml={report_path}']
+        if os.environ.get('CI'):
+            test_args += ['-p', 'no:cacheprovider']
+        test_args += sys.argv[1:]
         
-        if success:
-            print(f"PASS: {description}")
-        else:
-            print(f"FAIL: {description}")
+        print("\nRunning test suite")
+        print("-" * 30)
+        print(f"Running: pytest {' '.join(test_args)}")
+        exit_code = pytest.main(test_args)
+        totals = summarize_junit(report_path) if os.path.exists(report_path) else {}
     
     print("\n" + "=" * 50)
     print("Test Summary:")
-    for test_name, success in results.items():
-        status = "PASS" if success else "FAIL"
-        print(f"  {status}: {test_name}")
+    for test_name, counts in totals.items():
+        status = "FAIL" if counts['failed'] else "PASS"
+        print(f"  {status}: {test_name} ({counts['passed']} passed, {counts['failed']} failed, "
+              f"{counts['skipped']} skipped)")
     
-    if not all(results.values()):
+    if exit_code != pytest.ExitCode.OK:
         print("\nSome tests failed!")
         sys.exit(1)
     else:
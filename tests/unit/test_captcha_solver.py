@@ -0,0 +1,221 @@
+import asyncio
+import itertools
+import time
+
+import pytest
+
+from reddit_scraper.captcha_solver import (
+    AsyncTaskPoller,
+    CaptchaSolution,
+    CaptchaSolverManager,
+    _token_store_key,
+)
+from reddit_scraper.token_store import SQLiteTokenStore
+
+
+def _immediately():
+    return itertools.repeat(0.0)
+
+
+@pytest.mark.unit
+class TestAsyncTaskPoller:
+    
+    async def test_polls_due_tasks_together(self):
+        in_flight = []
+        peak = 0
+        
+        async def fetch_result(task_id):
+            nonlocal peak
+            in_flight.append(task_id)
+            peak = max(peak, len(in_flight))
+            await asyncio.sleep(0)
+            in_flight.remove(task_id)
+            return {'id': task_id}
+        
+        poller = AsyncTaskPoller(fetch_result)
+        futures = [poller.submit(task_id, _immediately()) for task_id in "abc"]
+        
+        assert await asyncio.gather(*futures) == [{'id': 'a'}, {'id': 'b'}, {'id': 'c'}]
+        assert peak == 3
+        assert not poller.pending
+    
+    async def test_task_submitted_during_poll_is_picked_up(self):
+        gate = asyncio.Event()
+        
+        async def fetch_result(task_id):
+            if task_id == 'a':
+                await gate.wait()
+            return {'id': task_id}
+        
+        poller = AsyncTaskPoller(fetch_result)
+        first = poller.submit('a', _immediately())
+        await asyncio.sleep(0.01)
+        second = poller.submit('b', _immediately())
+        gate.set()
+        
+        assert await asyncio.gather(first, second) == [{'id': 'a'}, {'id': 'b'}]
+    
+    async def test_timeout_then_discard_stops_polling(self):
+        calls = []
+        
+        async def fetch_result(task_id):
+            calls.append(task_id)
+            return None
+        
+        poller = AsyncTaskPoller(fetch_result)
+        future = poller.submit('a', itertools.repeat(0.005))
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(future, 0.05)
+        poller.discard('a')
+        await asyncio.sleep(0.02)
+        polled = len(calls)
+        await asyncio.sleep(0.02)
+        
+        assert polled > 1
+        assert len(calls) == polled
+        assert not poller.pending
+        assert poller._task.done()
+    
+    async def test_fetch_error_is_raised_to_waiter(self):
+        async def fetch_result(task_id):
+            raise RuntimeError(task_id)
+        
+        poller = AsyncTaskPoller(fetch_result)
+        
+        with pytest.raises(RuntimeError, match="a"):
+            await poller.submit('a', _immediately())
+        assert not poller.pending
+    
+    async def test_cancelled_fetch_cancels_waiter(self):
+        async def fetch_result(task_id):
+            raise asyncio.CancelledError()
+        
+        poller = AsyncTaskPoller(fetch_result)
+        future = poller.submit('a', _immediately())
+        
+        with pytest.raises(asyncio.CancelledError):
+            await future
+        assert future.cancelled()
+    
+    async def test_close_cancels_pending_futures(self):
+        async def fetch_result(task_id):
+            return None
+        
+        poller = AsyncTaskPoller(fetch_result)
+        futures = [poller.submit(task_id, itertools.repeat(60.0)) for task_id in "ab"]
+        
+        await poller.close()
+        
+        assert all(future.cancelled() for future in futures)
+        assert not poller.pending
+        assert poller._task is None
+
+
+def _stub_solver(name="solve_recaptcha_v2"):
+    calls = []
+    
+    def solve(website_url, website_key):
+        calls.append(website_url)
+        return CaptchaSolution(success=True, solution=f"token-{len(calls)}")
+    
+    solve.__name__ = name
+    return solve, calls
+
+
+@pytest.mark.unit
+class TestTokenReuse:
+    
+    URL = "https://www.reddit.com/login"
+    
+    def test_cached_token_is_reused(self):
+        manager = CaptchaSolverManager("key")
+        solve, calls = _stub_solver()
+        
+        first = manager.solve_with_retry(solve, self.URL, "site-key")
+        second = manager.solve_with_retry(solve, self.URL, "site-key")
+        
+        assert first.solution == second.solution == "token-1"
+        assert len(calls) == 1
+    
+    def test_only_token_solvers_are_cached(self):
+        manager = CaptchaSolverManager("key")
+        solve, calls = _stub_solver("solve_image_captcha")
+        
+        manager.solve_with_retry(solve, self.URL, "site-key")
+        manager.solve_with_retry(solve, self.URL, "site-key")
+        
+        assert len(calls) == 2
+        assert not manager._token_cache
+    
+    def test_expired_token_is_solved_again(self):
+        manager = CaptchaSolverManager("key", token_ttl=60)
+        solve, calls = _stub_solver()
+        manager.solve_with_retry(solve, self.URL, "site-key")
+        key, (solved_at, solution) = next(iter(manager._token_cache.items()))
+        manager._token_cache[key] = (solved_at - 60, solution)
+        
+        assert manager.solve_with_retry(solve, self.URL, "site-key").solution == "token-2"
+        assert len(calls) == 2
+    
+    def test_mark_token_invalid_forces_fresh_solve(self, tmp_path):
+        store = SQLiteTokenStore(str(tmp_path / "tokens.db"))
+        manager = CaptchaSolverManager("key", token_store=store)
+        solve, calls = _stub_solver()
+        manager.solve_with_retry(solve, self.URL, "site-key")
+        
+        manager.mark_token_invalid(solve, self.URL, "site-key")
+        
+        assert not manager._token_cache
+        assert manager.solve_with_retry(solve, self.URL, "site-key").solution == "token-2"
+        store.close()
+    
+    def test_stored_token_keeps_remaining_ttl(self, tmp_path):
+        store = SQLiteTokenStore(str(tmp_path / "tokens.db"))
+        manager = CaptchaSolverManager("key", token_ttl=110, token_store=store)
+        solve, calls = _stub_solver()
+        key = manager._token_cache_key(solve, (self.URL, "site-key"), {})
+        store.set(_token_store_key(key), "stored-token", 5)
+        
+        solution = manager.solve_with_retry(solve, self.URL, "site-key")
+        solved_at, _ = manager._token_cache[key]
+        
+        assert solution.solution == "stored-token"
+        assert not calls
+        assert time.monotonic() - solved_at == pytest.approx(105, abs=1)
+        store.close()
+
+
+@pytest.mark.unit
+class TestBalanceCache:
+    
+    def test_balance_reused_within_ttl(self, monkeypatch):
+        manager = CaptchaSolverManager("key", balance_ttl=30)
+        calls = []
+        monkeypatch.setattr(manager.solver, "get_balance", lambda: calls.append(1) or 5.0)
+        
+        assert manager._get_balance() == manager._get_balance() == 5.0
+        assert len(calls) == 1
+        
+        manager._balance_ts -= 30
+        manager._get_balance()
+        assert len(calls) == 2
+    
+    async def test_async_balance_refresh_task_stopped_on_close(self, monkeypatch):
+        manager = CaptchaSolverManager("key", balance_ttl=30)
+        calls = []
+        
+        async def get_balance():
+            calls.append(1)
+            return 5.0
+        
+        monkeypatch.setattr(manager.async_solver, "get_balance", get_balance)
+        
+        assert await manager._get_balance_async() == await manager._get_balance_async() == 5.0
+        assert len(calls) == 1
+        refresh = manager._balance_task
+        assert not refresh.done()
+        
+        await manager.close()
+        
+        assert refresh.cancelled()
+        assert manager._balance_task is None
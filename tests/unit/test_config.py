@@ -1,10 +1,13 @@
+import gc
 import pytest
 import json
-import tempfile
 import os
 from unittest.mock import patch, mock_open
 
-from reddit_scraper.config import ConfigManager, ProxyConfig, CaptchaConfig, ScrapingConfig
+from reddit_scraper import config as config_module
+from reddit_scraper.config import (
+    ConfigManager, ProxyConfig, CaptchaConfig, ScrapingConfig, get_config_manager, reload_config
+)
 
 
 @pytest.mark.unit
@@ -66,14 +69,13 @@ class TestScrapingConfig:
 class TestConfigManager:
     
     def test_config_manager_init_no_file(self):
-        with patch('os.path.exists', return_value=False):
-            manager = ConfigManager("nonexistent.json")
-            
-            assert len(manager.proxies) == 0
-            assert len(manager.captcha_solvers) == 0
-            assert isinstance(manager.scraping_config, ScrapingConfig)
-    
-    def test_config_manager_init_with_file(self):
+        manager = ConfigManager(None)
+        
+        assert len(manager.proxies) == 0
+        assert len(manager.captcha_solvers) == 0
+        assert isinstance(manager.scraping_config, ScrapingConfig)
+    
+    def test_config_manager_from_dict(self):
         config_data = {
             "proxies": [
                 {
@@ -97,21 +99,25 @@ class TestConfigManager:
             }
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp:
-            try:
-                json.dump(config_data, tmp)
-                tmp.flush()
-                
-                manager = ConfigManager(tmp.name)
-                
-                assert len(manager.proxies) == 1
-                assert manager.proxies[0].host == "proxy.example.com"
-                assert len(manager.captcha_solvers) == 1
-                assert manager.captcha_solvers[0].api_key == "test-key"
-                assert manager.scraping_config.default_delay == 2.0
-                
-            finally:
-                os.unlink(tmp.name)
+        manager = ConfigManager.from_dict(config_data)
+        
+        assert len(manager.proxies) == 1
+        assert manager.proxies[0].host == "proxy.example.com"
+        assert len(manager.captcha_solvers) == 1
+        assert manager.captcha_solvers[0].api_key == "test-key"
+        assert manager.scraping_config.default_delay == 2.0
+        assert manager.scraping_config.max_retries == 5
+    
+    def test_config_manager_init_with_file(self, tmp_path):
+        path = tmp_path / "cfg.json"
+        path.write_text(json.dumps({"proxies": [
+            {"host": "proxy.example.com", "port": 8080, "username": "user", "password": "pass", "proxy_type": "http"}
+        ]}))
+        
+        manager = ConfigManager(str(path))
+        
+        assert manager.config_file == str(path)
+        assert [p.host for p in manager.proxies] == ["proxy.example.com"]
     
     @patch.dict(os.environ, {
         'PROXY_HTTP_HOST': 'env-proxy.com',
@@ -120,26 +126,24 @@ class TestConfigManager:
         'PROXY_HTTP_PASSWORD': 'env-pass'
     })
     def test_config_manager_env_variables(self):
-        with patch('os.path.exists', return_value=False):
-            manager = ConfigManager("nonexistent.json")
-            
-            assert len(manager.proxies) == 1
-            assert manager.proxies[0].host == "env-proxy.com"
-            assert manager.proxies[0].port == 9090
-            assert manager.proxies[0].proxy_type == "http"
+        manager = ConfigManager(None)
+        
+        assert len(manager.proxies) == 1
+        assert manager.proxies[0].host == "env-proxy.com"
+        assert manager.proxies[0].port == 9090
+        assert manager.proxies[0].proxy_type == "http"
     
     @patch.dict(os.environ, {
         'CAPSOLVER_API_KEY': 'env-api-key'
     })
     def test_config_manager_captcha_env(self):
-        with patch('os.path.exists', return_value=False):
-            manager = ConfigManager("nonexistent.json")
-            
-            assert len(manager.captcha_solvers) == 1
-            assert manager.captcha_solvers[0].api_key == "env-api-key"
+        manager = ConfigManager(None)
+        
+        assert len(manager.captcha_solvers) == 1
+        assert manager.captcha_solvers[0].api_key == "env-api-key"
     
     def test_config_manager_methods(self):
-        manager = ConfigManager("nonexistent.json")
+        manager = ConfigManager(None)
         
         assert not manager.has_proxies()
         assert not manager.has_captcha_solvers()
@@ -149,22 +153,19 @@ class TestConfigManager:
         assert isinstance(manager.get_scraping_config(), ScrapingConfig)
     
     def test_save_example_config(self):
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp:
-            try:
-                manager = ConfigManager("nonexistent.json")
-                manager.save_example_config(tmp.name)
-                
-                with open(tmp.name, 'r') as f:
-                    data = json.load(f)
-                    
-                assert 'proxies' in data
-                assert 'captcha_solvers' in data
-                assert 'scraping' in data
-                assert len(data['proxies']) > 0
-                assert len(data['captcha_solvers']) > 0
-                
-            finally:
-                os.unlink(tmp.name)
+        manager = ConfigManager(None)
+        
+        with patch('builtins.open', mock_open()) as mocked:
+            manager.save_example_config("cfg.json")
+        
+        mocked.assert_called_once_with("cfg.json", 'wb')
+        data = json.loads(b''.join(call.args[0] for call in mocked().write.call_args_list))
+        
+        assert 'proxies' in data
+        assert 'captcha_solvers' in data
+        assert 'scraping' in data
+        assert len(data['proxies']) > 0
+        assert len(data['captcha_solvers']) > 0
     
     def test_validate_config(self):
         manager = ConfigManager("nonexistent.json")
@@ -174,14 +175,66 @@ class TestConfigManager:
         except Exception as e:
             pytest.fail(f"Config validation failed: {e}")
     
-    def test_invalid_json_handling(self):
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp:
-            try:
-                tmp.write("invalid json content")
-                tmp.flush()
-                
-                manager = ConfigManager(tmp.name)
-                assert len(manager.proxies) == 0
-                
-            finally:
-                os.unlink(tmp.name)
\ No newline at end of file
+    def test_large_config_file(self, tmp_path):
+        proxies = [
+            {"host": f"proxy{i}.example.com", "port": 8080, "username": "user",
+             "password": "pass", "proxy_type": "http"}
+            for i in range(200)
+        ]
+        path = tmp_path / "large.json"
+        path.write_text(json.dumps({"proxies": proxies}))
+        assert path.stat().st_size > config_module._MMAP_MIN_SIZE
+        
+        manager = ConfigManager(str(path))
+        
+        assert len(manager.proxies) == 200
+        assert manager.proxies[-1].host == "proxy199.example.com"
+        assert gc.isenabled()
+    
+    def test_large_invalid_config_file(self, tmp_path):
+        path = tmp_path / "large.json"
+        path.write_text('{"proxies": [' + ' ' * config_module._MMAP_MIN_SIZE)
+        
+        manager = ConfigManager(str(path))
+        
+        assert manager.proxies == []
+        assert gc.isenabled()
+    
+    def test_invalid_json_handling(self, tmp_path):
+        path = tmp_path / "cfg.json"
+        path.write_text("invalid json content")
+        
+        manager = ConfigManager(str(path))
+        
+        assert len(manager.proxies) == 0
+
+
+@pytest.mark.unit
+class TestGetConfigManager:
+    
+    def test_cached_per_config_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config_module, "_config_managers", {})
+        first = tmp_path / "first.json"
+        second = tmp_path / "second.json"
+        first.write_text("{}")
+        second.write_text("{}")
+        
+        manager = get_config_manager(str(first))
+        
+        assert get_config_manager(str(first)) is manager
+        assert get_config_manager(str(second)) is not manager
+    
+    def test_reload_replaces_only_that_entry(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config_module, "_config_managers", {})
+        first = tmp_path / "first.json"
+        second = tmp_path / "second.json"
+        first.write_text("{}")
+        second.write_text("{}")
+        manager = get_config_manager(str(first))
+        other = get_config_manager(str(second))
+        
+        reloaded = reload_config(str(first))
+        
+        assert reloaded is not manager
+        assert get_config_manager(str(first)) is reloaded
+        assert get_config_manager(str(second)) is other
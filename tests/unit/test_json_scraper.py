@@ -1,11 +1,33 @@
+import asyncio
 import pytest
 import aiohttp
 from unittest.mock import Mock, AsyncMock, patch
 from aioresponses import aioresponses
 
 from reddit_scraper import JSONScraper
+from reddit_scraper import json_scraper as json_scraper_module
 from reddit_scraper.validation import ValidationError
 
+POST_DATA = {
+    "id": "abc123",
+    "title": "Test Post Title",
+    "author": "test_user",
+    "score": 42,
+    "num_comments": 5,
+    "url": "https://reddit.com/r/test/comments/abc123/test_post/",
+    "selftext": "This is a test post content",
+    "created_utc": 1640995200,
+    "subreddit": "test",
+    "permalink": "/r/test/comments/abc123/test_post/"
+}
+COMMENT_DATA = {
+    "id": "comment1",
+    "author": "commenter1",
+    "body": "Great post!",
+    "score": 10,
+    "created_utc": 1640995200
+}
+
 
 @pytest.mark.unit
 class TestJSONScraperInit:
@@ -17,6 +39,7 @@ class TestJSONScraperInit:
         assert scraper.proxy_manager is None
         assert scraper.captcha_solver is None
         assert scraper.rotate_user_agents is True
+        assert scraper.retry_delay == 1.0
     
     def test_init_with_custom_values(self):
         scraper = JSONScraper(
@@ -32,19 +55,43 @@ class TestJSONScraperInit:
 @pytest.mark.unit 
 class TestJSONScraperHeaders:
     
+    BASE_HEADERS = {
+        'Accept': 'application/json',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'DNT': '1',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1'
+    }
+    
     def test_headers_with_custom_user_agent(self):
         scraper = JSONScraper(user_agent="TestAgent/1.0", rotate_user_agents=False)
         headers = scraper._get_headers()
         
-        assert headers['User-Agent'] == "TestAgent/1.0"
-        assert headers['Accept'] == 'application/json'
-        assert 'Accept-Language' in headers
+        assert headers == {**self.BASE_HEADERS, 'User-Agent': "TestAgent/1.0"}
     
     def test_headers_with_default_user_agent(self):
         scraper = JSONScraper(rotate_user_agents=False)
         headers = scraper._get_headers()
         
         assert headers['User-Agent'] == "RedditScraper/1.0"
+    
+    def test_static_headers_are_reused(self):
+        scraper = JSONScraper(rotate_user_agents=False)
+        
+        assert scraper._get_headers() is scraper._get_headers()
+    
+    def test_rotating_headers_draw_from_shared_pool(self, monkeypatch):
+        monkeypatch.setattr(json_scraper_module, "_ua_pool", ["Agent/1.0"] * 256)
+        scraper = JSONScraper()
+        headers = scraper._get_headers()
+        
+        assert headers == {**self.BASE_HEADERS, 'User-Agent': "Agent/1.0"}
+        assert headers is not scraper._get_headers()
+    
+    def test_base_headers_are_immutable(self):
+        with pytest.raises(TypeError):
+            JSONScraper._BASE_HEADERS['DNT'] = '0'
 
 
 @pytest.mark.unit
@@ -84,6 +131,34 @@ class TestJSONScraperRequests:
         
         assert result == sample_reddit_response
 
+    
+    async def test_concurrent_identical_requests_share_fetch(self, json_scraper, aiohttp_mock, sample_reddit_response):
+        url = "https://www.reddit.com/r/test/hot.json?limit=25"
+        aiohttp_mock.get(url, payload=sample_reddit_response)
+        
+        first, second = await asyncio.gather(
+            json_scraper._make_request("https://www.reddit.com/r/test/hot.json", {'limit': 25}),
+            json_scraper._make_request("https://www.reddit.com/r/test/hot.json", {'limit': 25})
+        )
+        
+        assert first == second == sample_reddit_response
+        assert sum(map(len, aiohttp_mock.requests.values())) == 1
+        assert json_scraper._inflight == {}
+    
+    async def test_batched_requests_flush_together(self, reddit_api, sample_reddit_response):
+        reddit_api["/r/a/hot.json"] = sample_reddit_response
+        reddit_api["/r/b/hot.json"] = 404
+        
+        async with JSONScraper(delay=0, batch_interval_ms=5) as scraper:
+            first, second = await asyncio.gather(
+                scraper._make_request("https://www.reddit.com/r/a/hot.json", {'limit': 25}),
+                scraper._make_request("https://www.reddit.com/r/b/hot.json", {'limit': 25})
+            )
+        
+        assert first == sample_reddit_response
+        assert second is None
+        assert scraper._batcher is None
+
 
 @pytest.mark.unit
 class TestJSONScraperSubreddit:
@@ -123,6 +198,47 @@ class TestJSONScraperSubreddit:
         posts = await json_scraper.scrape_subreddit("test", "hot", 25)
         
         assert posts == []
+    
+    async def test_scrape_subreddit_paginates_with_after(self, json_scraper, monkeypatch):
+        pages = [
+            {"data": {
+                "children": [{"kind": "t3", "data": {"id": f"{page}_{i}"}} for i in range(100)],
+                "after": f"t3_{page}"
+            }}
+            for page in range(3)
+        ]
+        monkeypatch.setattr(json_scraper, "_make_request", AsyncMock(side_effect=pages))
+        
+        posts = await json_scraper.scrape_subreddit("test", "hot", 150)
+        
+        assert len(posts) == 150
+        assert posts[-1]['id'] == "1_49"
+        params = [call.args[1] for call in json_scraper._make_request.await_args_list]
+        assert params == [
+            {'limit': 100, 'raw_json': 1},
+            {'limit': 50, 'raw_json': 1, 'after': 't3_0'}
+        ]
+
+    
+    async def test_scrape_multiple_subreddits_bounds_concurrency(self, json_scraper, monkeypatch):
+        in_flight = 0
+        peak = 0
+        
+        async def fake_scrape(subreddit, sort_by, limit):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [{'id': subreddit}]
+        
+        monkeypatch.setattr(json_scraper, "_scrape_subreddit", fake_scrape)
+        names = [f"sub{i}" for i in range(6)]
+        
+        results = await json_scraper.scrape_multiple_subreddits(names, max_concurrency=2)
+        
+        assert peak == 2
+        assert results["sub5"] == [{'id': "sub5"}]
 
 
 @pytest.mark.unit
@@ -179,36 +295,107 @@ class TestJSONScraperSession:
         await json_scraper.close_session()
         
         assert json_scraper._session is None
+    
+    async def test_context_manager_keeps_session(self, json_scraper):
+        async with json_scraper as scraper:
+            session = scraper._session
+            with patch.object(scraper, '_make_request', new_callable=AsyncMock, return_value=None):
+                await scraper.scrape_subreddit("test", "hot", 5)
+            
+            assert scraper._session is session
+            assert not session.closed
+        
+        assert session.closed
+        assert json_scraper._session is None
 
 
 @pytest.mark.unit
 class TestJSONScraperDataCleaning:
     
-    def test_clean_post_data(self, json_scraper, sample_reddit_post):
-        cleaned = json_scraper._clean_post_data(sample_reddit_post['data'])
+    @pytest.mark.parametrize("method, raw, expected_keys, expected_values", [
+        ("_clean_post_data", POST_DATA, ('id', 'title', 'author', 'score', 'num_comments', 'url'),
+         {'title': "Test Post Title", 'author': "test_user", 'score': 42}),
+        ("_clean_comment_data", COMMENT_DATA, ('id', 'author', 'body', 'score', 'created_utc'),
+         {'body': "Great post!", 'score': 10}),
+    ])
+    def test_clean(self, json_scraper, method, raw, expected_keys, expected_values):
+        cleaned = getattr(json_scraper, method)(raw)
         
-        expected_keys = ['id', 'title', 'author', 'score', 'num_comments', 'url']
-        for key in expected_keys:
-            assert key in cleaned
-            
-        assert cleaned['title'] == "Test Post Title"
-        assert cleaned['author'] == "test_user"
-        assert cleaned['score'] == 42
-    
-    def test_clean_comment_data(self, json_scraper):    
-        comment_data = {
-            "id": "comment1",
-            "author": "commenter1", 
-            "body": "Great post!",
-            "score": 10,
-            "created_utc": 1640995200
-        }
+        assert set(expected_keys) <= cleaned.keys()
+        assert {key: cleaned[key] for key in expected_values} == expected_values
+    
+    def test_extract_comments_nested_replies(self, json_scraper):
+        children = [
+            {
+                "kind": "t1",
+                "data": {
+                    "id": "parent",
+                    "body": "Parent",
+                    "replies": {
+                        "data": {
+                            "children": [
+                                {"kind": "t1", "data": {"id": "child", "body": "Child", "replies": ""}},
+                                {"kind": "more", "data": {"id": "more1"}}
+                            ]
+                        }
+                    }
+                }
+            },
+            {"kind": "t1", "data": {"id": "sibling", "body": "Sibling"}}
+        ]
         
-        cleaned = json_scraper._clean_comment_data(comment_data)
+        comments = json_scraper._extract_comments(children)
         
-        expected_keys = ['id', 'author', 'body', 'score', 'created_utc']
-        for key in expected_keys:
-            assert key in cleaned
-            
-        assert cleaned['body'] == "Great post!"
-        assert cleaned['score'] == 10
\ No newline at end of file
+        assert [c['id'] for c in comments] == ['parent', 'sibling']
+        assert [c['id'] for c in comments[0]['replies']] == ['child']
+        assert 'replies' not in comments[0]['replies'][0]
+    
+    def test_extract_comments_deep_thread(self, json_scraper):
+        depth = 5000
+        children = []
+        for i in reversed(range(depth)):
+            data = {"id": f"c{i}", "body": "reply"}
+            if children:
+                data["replies"] = {"data": {"children": children}}
+            children = [{"kind": "t1", "data": data}]
+        
+        comments = json_scraper._extract_comments(children)
+        
+        levels = 0
+        while comments:
+            levels += 1
+            comments = comments[0].get('replies', [])
+        assert levels == depth
+    
+    def test_clean_post_data_interns_repeated_strings(self, json_scraper):
+        first = json_scraper._clean_post_data({'id': 'a', 'subreddit': ''.join(['py', 'thon']), 'domain': ''.join(['ex', '.com'])})
+        second = json_scraper._clean_post_data({'id': 'b', 'subreddit': ''.join(['pyt', 'hon']), 'domain': ''.join(['e', 'x.com'])})
+        
+        assert first['subreddit'] is second['subreddit']
+        assert first['domain'] is second['domain']
+    
+    def test_clean_post_row(self, json_scraper, sample_reddit_post):
+        row = json_scraper._clean_post_row(sample_reddit_post['data'])
+        
+        assert row.title == "Test Post Title"
+        assert row.author == "test_user"
+        assert row._fields[-1] == 'domain'
+        assert json_scraper._clean_post_row({}).id is None
+    
+    def test_clean_post_row_matches_clean_post_data(self, json_scraper):
+        raw = {'id': 'a', 'subreddit': ''.join(['py', 'thon']), 'is_self': True, 'over_18': False,
+               'domain': 'self.python'}
+        
+        row = json_scraper._clean_post_row(raw)
+        
+        assert {k: v for k, v in row._asdict().items() if v is not None} == json_scraper._clean_post_data(raw)
+        assert row.domain is None and row.over_18 is None
+        assert row.subreddit is json_scraper._clean_post_data({'subreddit': ''.join(['pyt', 'hon'])})['subreddit']
+    
+    def test_clean_listing_skips_non_posts(self, json_scraper, sample_reddit_post):
+        children = [sample_reddit_post, {'kind': 't1', 'data': {'id': 'c1'}}]
+        
+        posts = list(json_scraper._clean_listing(children))
+        
+        assert len(posts) == 1
+        assert posts[0]['title'] == "Test Post Title"
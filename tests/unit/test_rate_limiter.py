@@ -0,0 +1,31 @@
+import asyncio
+import time
+
+import pytest
+from reddit_scraper.rate_limiter import TokenBucket
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError, match="rate must be positive"):
+            TokenBucket(0)
+    
+    def test_burst_is_immediate(self):
+        bucket = TokenBucket(rate=1, burst=3)
+        start = time.monotonic()
+        for _ in range(3):
+            bucket.acquire_blocking()
+        assert time.monotonic() - start < 0.1
+    
+    def test_acquire_waits_when_empty(self):
+        bucket = TokenBucket(rate=20, burst=1)
+        
+        async def run():
+            start = time.monotonic()
+            for _ in range(3):
+                await bucket.acquire()
+            return time.monotonic() - start
+        
+        assert asyncio.run(run()) >= 0.09
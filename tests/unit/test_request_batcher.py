@@ -0,0 +1,47 @@
+import asyncio
+import pytest
+
+from reddit_scraper.request_batcher import RequestBatcher
+
+
+@pytest.mark.unit
+class TestRequestBatcher:
+    
+    async def test_groups_requests_within_window(self):
+        batches = []
+        
+        async def fetch(url, params):
+            return url, params
+        
+        batcher = RequestBatcher(fetch, interval_ms=5)
+        run = batcher._run
+        
+        async def record_run(batch):
+            batches.append(len(batch))
+            await run(batch)
+        
+        batcher._run = record_run
+        results = await asyncio.gather(*(batcher.submit(f"https://host/{i}", {'i': i}) for i in range(3)))
+        
+        assert results == [(f"https://host/{i}", {'i': i}) for i in range(3)]
+        assert batches == [3]
+    
+    async def test_flushes_when_full_and_propagates_errors(self):
+        calls = []
+        
+        async def fetch(url, params, fail=False):
+            calls.append(url)
+            if fail:
+                raise RuntimeError(url)
+            return url
+        
+        batcher = RequestBatcher(fetch, interval_ms=10_000, max_size=2)
+        ok, failed = await asyncio.gather(
+            batcher.submit("https://b.test/ok"),
+            batcher.submit("https://a.test/bad", fail=True),
+            return_exceptions=True
+        )
+        
+        assert ok == "https://b.test/ok"
+        assert isinstance(failed, RuntimeError)
+        assert calls == ["https://a.test/bad", "https://b.test/ok"]
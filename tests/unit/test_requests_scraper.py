@@ -0,0 +1,118 @@
+import json
+import pytest
+import responses
+
+from reddit_scraper import RequestsScraper
+
+
+def _comment(comment_id, replies=None):
+    data = {'id': comment_id, 'body': comment_id}
+    if replies:
+        data['replies'] = {'data': {'children': replies}}
+    return {'kind': 't1', 'data': data}
+
+
+@pytest.mark.unit
+class TestExtractAllComments:
+    
+    def test_depth_first_order(self):
+        tree = [
+            _comment('a', [_comment('a1', [_comment('a1x')]), _comment('a2')]),
+            {'kind': 'more', 'data': {}},
+            _comment('b')
+        ]
+        comments = []
+        
+        RequestsScraper(delay=0)._extract_all_comments(tree, comments)
+        
+        assert [(c['id'], c['depth']) for c in comments] == [('a', 0), ('a1', 1), ('a1x', 2), ('a2', 1), ('b', 0)]
+    
+    def test_deep_thread_does_not_recurse(self):
+        thread = _comment('leaf')
+        for i in range(5000):
+            thread = _comment(str(i), [thread])
+        comments = []
+        
+        RequestsScraper(delay=0)._extract_all_comments([thread], comments)
+        
+        assert len(comments) == 5001
+        assert comments[-1]['depth'] == 5000
+
+
+@pytest.mark.unit
+class TestBulkScrape:
+    
+    @pytest.mark.parametrize("output_format", ["json", "jsonl"])
+    def test_bulk_scrape_streams_posts(self, tmp_path, monkeypatch, output_format):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "subs.txt").write_text("python\n")
+        scraper = RequestsScraper(delay=0)
+        monkeypatch.setattr(scraper, "scrape_subreddit_paginated",
+                            lambda subreddit, max_posts: iter([{'id': 'a'}, {'id': 'b'}]))
+        
+        scraper.bulk_scrape_subreddits("subs.txt", output_format)
+        
+        content = (tmp_path / f"python_posts.{output_format}").read_text()
+        if output_format == "json":
+            assert json.loads(content) == [{'id': 'a'}, {'id': 'b'}]
+        else:
+            assert [json.loads(line) for line in content.splitlines()] == [{'id': 'a'}, {'id': 'b'}]
+
+
+@pytest.mark.unit
+class TestSessionRetries:
+    
+    @responses.activate
+    def test_rate_limited_response_is_not_retried_by_urllib3(self):
+        url = "https://www.reddit.com/r/python/hot.json"
+        responses.add(responses.GET, url, status=429, headers={'Retry-After': '3600'})
+        scraper = RequestsScraper(delay=0)
+        
+        assert scraper._make_request(url) is None
+        assert len(responses.calls) == 1
+
+
+@pytest.mark.unit
+class TestConditionalRequests:
+    
+    @responses.activate
+    def test_not_modified_returns_cached_body(self):
+        url = "https://www.reddit.com/r/python/hot.json"
+        body = {'data': {'children': []}}
+        responses.add(responses.GET, url, json=body, headers={'ETag': '"v1"'})
+        responses.add(responses.GET, url, status=304)
+        scraper = RequestsScraper(delay=0)
+        
+        first = scraper._make_request(url, {'limit': 100})
+        second = scraper._make_request(url, {'limit': 100})
+        
+        assert first == second == body
+        assert first is not second
+        assert responses.calls[1].request.headers['If-None-Match'] == '"v1"'
+    
+    @pytest.mark.parametrize("url, params", [
+        ("https://www.reddit.com/r/python/hot.json", {'limit': 100, 'after': 't3_x'}),
+        ("https://www.reddit.com/r/python/comments/abc.json", None),
+    ])
+    @responses.activate
+    def test_cursor_pages_and_threads_are_not_cached(self, url, params):
+        responses.add(responses.GET, url, json={'data': {}}, headers={'ETag': '"v1"'})
+        scraper = RequestsScraper(delay=0)
+        
+        scraper._make_request(url, params)
+        scraper._make_request(url, params)
+        
+        assert not scraper._etag_cache
+        assert 'If-None-Match' not in responses.calls[1].request.headers
+    
+    def test_lean_mode_yields_raw_post_dicts(self, monkeypatch):
+        raw = {'id': 'a', 'title': 't', 'thumbnail': 'self'}
+        listing = {'data': {'children': [{'kind': 't3', 'data': raw}], 'after': None}}
+        scraper = RequestsScraper(delay=0)
+        monkeypatch.setattr(scraper, "_make_request", lambda url, params: listing)
+        
+        lean = list(scraper.scrape_subreddit_paginated("python", lean=True))
+        cleaned = list(scraper.scrape_subreddit_paginated("python"))
+        
+        assert lean[0] is raw
+        assert cleaned == [{'id': 'a', 'title': 't'}]
@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+from reddit_scraper.token_store import SQLiteTokenStore
+
+
+@pytest.mark.unit
+class TestSQLiteTokenStore:
+    
+    def test_set_get_delete(self, tmp_path):
+        store = SQLiteTokenStore(str(tmp_path / "tokens.db"))
+        store.set("key", "token", ttl=60)
+        
+        expires_at, token = store.get("key")
+        assert token == "token"
+        assert expires_at > time.time()
+        
+        store.delete("key")
+        assert store.get("key") is None
+        store.close()
+    
+    def test_expired_token_not_returned(self, tmp_path):
+        store = SQLiteTokenStore(str(tmp_path / "tokens.db"))
+        store.set("key", "token", ttl=-1)
+        
+        assert store.get("key") is None
+        store.close()
+    
+    def test_shared_between_connections(self, tmp_path):
+        path = str(tmp_path / "tokens.db")
+        writer = SQLiteTokenStore(path)
+        reader = SQLiteTokenStore(path)
+        writer.set("key", "token", ttl=60)
+        
+        assert reader.get("key")[1] == "token"
+        writer.close()
+        reader.close()
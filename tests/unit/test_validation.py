@@ -33,6 +33,9 @@ class TestSubredditValidation:
             
         with pytest.raises(ValidationError, match="Invalid subreddit name"):
             validate_subreddit_name("with-dash")
+            
+        with pytest.raises(ValidationError, match="Invalid subreddit name"):
+            validate_subreddit_name("python\n")
     
     def test_reserved_subreddit_names(self):
         with pytest.raises(ValidationError, match="reserved or problematic"):
@@ -55,6 +58,9 @@ class TestUsernameValidation:
             
         with pytest.raises(ValidationError, match="Invalid username"):
             validate_username("user!")
+            
+        with pytest.raises(ValidationError, match="Invalid username"):
+            validate_username("user123\n")
 
 
 class TestPostIdValidation:
@@ -125,6 +131,12 @@ class TestUrlValidation:
             
         with pytest.raises(ValidationError, match="Invalid URL format"):
             validate_url("ftp://invalid.com")
+    
+    @pytest.mark.parametrize("url", ["http://exa mple.com", "http://x.com\n"])
+    def test_malformed_http_url_is_not_a_scheme_error(self, url):
+        with pytest.raises(ValidationError, match="Invalid URL format") as exc_info:
+            validate_url(url)
+        assert "only HTTP/HTTPS" not in str(exc_info.value)
 
 
 class TestDelayValidation: